@@ -1,5 +1,3 @@
-import os
-import tempfile
 from fastapi import (
     APIRouter,
     status,
@@ -8,30 +6,35 @@ from fastapi import (
     Header,
     Query,
     )
-from fastapi import BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
 from fastapi.security import (
     HTTPBearer,
     HTTPAuthorizationCredentials
     )
 
-from openpyxl import Workbook
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 
-from ....core.selenium import driver
 from ....core.config import settings
-from ....service.selenium_service import (
-    flujo_principal
+from ....service.job_service import (
+    create_scrape_job,
+    get_job,
+    get_job_status,
+    resume_job,
 )
-from ....db.database import get_db
+from ....db.database import get_db, get_async_db
 from ....schemas.user_schema import UserInfo
 from ....schemas.generic import OffersList
+from ....schemas.scrape_job_schema import ScrapeJobStatus
 from ....service.user_service import get_user_by_email
 from ....core.logger_config import logger
-from ....db.models.candidate import Candidate
-from ....db.models.candidate_detail import CandidateDetail
-from ....service.candidate_service import get_candidates_by_offer
+from ....service.candidate_service import (
+    get_candidates_by_offer,
+    offer_has_candidates,
+    stream_candidates_csv,
+    stream_candidates_xlsx,
+)
 
 
 bearer_scheme = HTTPBearer()
@@ -81,26 +84,70 @@ async def validate_token(
     )
 async def scrape_job_offers(
     list_offers: OffersList,
-    background_tasks: BackgroundTasks,
     current_user: str = Depends(validate_token),
     db: Session = Depends(get_db)
 ):
     email = current_user
     user = get_user_by_email(db, email)
     user = UserInfo.model_validate(user)
-    password = user.password
-    
-    try:
-        
-        background_tasks.add_task(flujo_principal, db, email, password, list_offers)
-        # await flujo_principal(db, email, password, list_offers)
 
+    try:
+        job = create_scrape_job(
+            db,
+            user.id,
+            email,
+            [offer.url for offer in list_offers.offers],
+            list_offers.incremental,
+            list_offers.resource_blocking,
+        )
     except Exception as e:
-        logger.error(f"Hubo un error en la ejecución principal: {e}")
+        logger.error(f"Hubo un error al encolar el trabajo de scraping: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
     return {
-        "message": "El API de scraping se está ejecutando en segundo plano. Por favor, consulte los registros para obtener más información."
+        "message": "El trabajo de scraping fue encolado. Consulte su progreso en /scraping/jobs/{job_id}.",
+        "job_id": job.id,
         }
 
+
+@scraping_router.get(
+    "/jobs/{job_id}",
+    operation_id="get_scrape_job",
+    summary="Get scrape job progress",
+    description="Get the status, progress and throughput of a scrape job.",
+    response_model=ScrapeJobStatus)
+async def get_scrape_job(
+    job_id: int,
+    current_user: str = Depends(validate_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    job = await db.run_sync(get_job, job_id, current_user)
+    if not job:
+        raise HTTPException(status_code=404, detail="No se encontró el trabajo de scraping.")
+    return get_job_status(job)
+
+
+@scraping_router.post(
+    "/jobs/{job_id}/resume",
+    operation_id="resume_scrape_job",
+    summary="Resume a scrape job",
+    description="Queue again a failed scrape job. It resumes from the last page finished on each offer.",
+    response_model=ScrapeJobStatus)
+async def resume_scrape_job(
+    job_id: int,
+    current_user: str = Depends(validate_token),
+    db: Session = Depends(get_db)
+):
+    job = get_job(db, job_id, current_user)
+    if not job:
+        raise HTTPException(status_code=404, detail="No se encontró el trabajo de scraping.")
+    if job.status != "failed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Solo se pueden reanudar los trabajos fallidos.",
+        )
+    return get_job_status(resume_job(db, job))
+
     
 @scraping_router.get(
     "/offers/{uuid_offer}/candidates",
@@ -113,7 +160,9 @@ async def get_candidates_by_offer_paginated(
     current_user: str = Depends(validate_token),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: int = Query(None, ge=0),
+    include_total: bool = Query(True),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all candidates of an offer with pagination, along with their details.
@@ -121,11 +170,16 @@ async def get_candidates_by_offer_paginated(
     :param uuid_offer: UUID of the offer to search for candidates.
     :param page: Page number (default: 1).
     :param page_size: Number of records per page (default: 10, max. 100).
-    :param db: Database session.
+    :param cursor: `next_cursor` of the previous page, enables keyset pagination.
+    :param include_total: Return the total of candidates (default: True).
+    :param db: Async database session.
     :return: Paginated list of candidates and their details.
     """
     try:
-        candidates = await get_candidates_by_offer(uuid_offer, db, page, page_size)        
+        candidates = await get_candidates_by_offer(
+            uuid_offer, db, page, page_size, cursor, include_total
+        )
+
         return {
             "data": candidates
         }
@@ -133,77 +187,43 @@ async def get_candidates_by_offer_paginated(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+EXPORT_MEDIA_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
 @scraping_router.get(
     "/offers/{uuid_offer}/candidates/export", 
     operation_id="export_candidates_to_excel",
     summary="Export candidates to Excel",
-    description="Export list the curriculum vitae of the candidates.",
+    description="Export list the curriculum vitae of the candidates as XLSX or CSV.",
     response_description="file Excel with candidates")
 async def export_candidates_to_excel(
     uuid_offer: str,
     current_user: str = Depends(validate_token),
-    db: Session = Depends(get_db)
+    file_format: str = Query("xlsx", alias="format", pattern="^(xlsx|csv)$"),
+    db: AsyncSession = Depends(get_async_db)
 ):
 
     try:
-        candidates = (
-            db.query(Candidate)
-            .filter(Candidate.uuid_offer == uuid_offer)
-            .all()
-        )
-
-        if not candidates:
+        if not await offer_has_candidates(db, uuid_offer):
             raise HTTPException(status_code=404, detail="No se encontraron candidatos para esta oferta.")
 
-        workbook = Workbook()
-        sheet = workbook.active
-        sheet.title = "Candidatos"
-
-        headers = [
-            "Nombre", "Fecha de Aplicación", "Edad", "Nivel Educativo", "Adecuación",
-            "Email", "ID Número", "Teléfono Móvil", "Teléfono Fijo", "Ubicación",
-            "Estado Civil", "Disponibilidad para Viajar", "Disponibilidad para Mudarse",
-            "Salario Mensual Neto", "Idiomas", "CV Link"
-        ]
-        sheet.append(headers)
-
-        for candidate in candidates:
-            candidate_details = (
-                db.query(CandidateDetail)
-                .filter(CandidateDetail.uuid_candidate == candidate.uuid_candidate)
-                .first()
-            )
-
-            row = [
-                candidate.name,
-                candidate.application_date,
-                candidate.age,
-                candidate.education_level,
-                candidate.suitability,
-                candidate_details.email if candidate_details else None,
-                candidate_details.id_number if candidate_details else None,
-                candidate_details.mobile_phone if candidate_details else None,
-                candidate_details.landline_phone if candidate_details else None,
-                candidate_details.location if candidate_details else None,
-                candidate_details.marital_status if candidate_details else None,
-                candidate_details.availability_to_travel if candidate_details else None,
-                candidate_details.availability_to_move if candidate_details else None,
-                candidate_details.net_monthly_salary if candidate_details else None,
-                candidate_details.languages if candidate_details else None,
-                candidate_details.cv_link if candidate_details else None,
-            ]
-            sheet.append(row)
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as temp_file:
-            file_path = temp_file.name
-            workbook.save(file_path)
-
-        return FileResponse(
-            path=file_path,
-            filename=f"candidatos_{uuid_offer}.xlsx",
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        if file_format == "csv":
+            content = stream_candidates_csv(uuid_offer)
+        else:
+            content = stream_candidates_xlsx(uuid_offer)
+
+        return StreamingResponse(
+            content,
+            media_type=EXPORT_MEDIA_TYPES[file_format],
+            headers={
+                "Content-Disposition": f'attachment; filename="candidatos_{uuid_offer}.{file_format}"'
+            },
         )
 
-
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
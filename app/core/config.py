@@ -1,4 +1,5 @@
 import os
+from typing import Literal
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -20,6 +21,9 @@ class Settings(BaseSettings):
     DB_DATABASE: str
     DB_USERNAME: str = "root"
     DB_PASSWORD: str = ""
+    # Pool propio del motor asíncrono, se suma al del motor síncrono
+    DB_ASYNC_POOL_SIZE: int = 10
+    DB_ASYNC_MAX_OVERFLOW: int = 5
 
     # AWS S3 Credentials
     AWS_ACCESS_KEY_ID: str
@@ -36,6 +40,48 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
+
+    # Scraping
+    COMPUTRABAJO_BASE_URL: str = "https://empresa.co.computrabajo.com"
+    SCRAPER_POOL_SIZE: int = 3
+    SCRAPER_DRIVER_IDLE_TIMEOUT: int = 300
+    SCRAPER_PARSE_FROM_SOURCE: bool = True
+    # Un valor desconocido falla al arrancar
+    SCRAPER_BLOCK_RESOURCES: Literal["none", "standard", "aggressive"] = "standard"
+    SCRAPER_PAGE_LOAD_STRATEGY: str = "eager"  # normal | eager | none
+    SCRAPER_READY_TIMEOUT: int = 20
+    SCRAPER_DETAIL_FETCHER: str = "browser"  # browser | http
+    SCRAPER_HTTP_CONCURRENCY: int = 8
+    SCRAPER_HTTP_TIMEOUT: int = 20
+    SCRAPER_RATE_PER_SECOND: float = 2.0
+    SCRAPER_RATE_BURST: int = 5
+    SCRAPER_PAGE_PAUSE_MIN: float = 0.5
+    SCRAPER_PAGE_PAUSE_MAX: float = 1.5
+    SCRAPER_DETAIL_TTL_HOURS: int = 168
+    SCRAPER_LISTING_PAGE_SIZE: int = 20
+    SCRAPER_OFFER_VALIDATION_TTL: int = 3600
+    SCRAPER_SESSION_DIR: str = "sessions"
+    SCRAPER_SESSION_TTL: int = 21600
+    SCRAPER_SESSION_CHECK_INTERVAL: int = 300
+
+    # Scrape jobs
+    SCRAPER_WORKERS: int = 2
+    SCRAPER_MAX_JOBS_PER_ACCOUNT: int = 1
+    SCRAPER_JOB_POLL_INTERVAL: int = 5
+    SCRAPER_JOB_HEARTBEAT_INTERVAL: int = 30
+    SCRAPER_JOB_STALE_AFTER: int = 120
+    SCRAPER_EMBEDDED_WORKERS: bool = True
+    SCRAPER_OFFER_ATTEMPTS: int = 2
+    SCRAPER_DETAIL_CHUNK_SIZE: int = 10
+    SCRAPER_DETAIL_WORKERS: int = 2  # solo con SCRAPER_DETAIL_FETCHER = http
+    SCRAPER_PIPELINE_QUEUE_SIZE: int = 4
+    SCRAPER_WRITE_BATCH_SIZE: int = 50
+    SCRAPER_PAGE_ATTEMPTS: int = 3
+    SCRAPER_LISTING_PREFETCH: int = 2  # solo con SCRAPER_DETAIL_FETCHER = http
+    SCRAPER_WORKER_METRICS_PORT: int = 9100  # 0 desactiva las métricas del worker
+
+    # Candidates API
+    CANDIDATES_COUNT_CACHE_TTL: int = 60
     
     class Config:
         env_file = ".env"
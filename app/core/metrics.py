@@ -0,0 +1,94 @@
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Buckets en segundos, desde una consulta rápida hasta una página que tarda en cargar
+SECONDS_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+PAGE_LOAD_SECONDS = Histogram(
+    "scraper_page_load_seconds",
+    "Time to load a page of the site, by page type.",
+    ["page"],
+    buckets=SECONDS_BUCKETS,
+)
+LISTING_PARSE_SECONDS = Histogram(
+    "scraper_listing_parse_seconds",
+    "Time to read the candidates or offers of a loaded listing page.",
+    ["listing"],
+    buckets=SECONDS_BUCKETS,
+)
+DETAIL_FETCH_SECONDS = Histogram(
+    "scraper_detail_fetch_seconds",
+    "Time to load and parse the detail page of one candidate.",
+    ["fetcher"],
+    buckets=SECONDS_BUCKETS,
+)
+DB_UPSERT_SECONDS = Histogram(
+    "scraper_db_upsert_seconds",
+    "Time to save one batch of rows, by table.",
+    ["table"],
+    buckets=SECONDS_BUCKETS,
+)
+PACING_SLEEP_SECONDS = Histogram(
+    "scraper_pacing_sleep_seconds",
+    "Time a request waited for the pacing scheduler.",
+    buckets=SECONDS_BUCKETS,
+)
+
+# Contadores por cuenta, los totales de cada trabajo se guardan en ScrapeJob
+SCRAPED_PAGES = Counter(
+    "scraper_pages_total", "Candidate listing pages saved.", ["account"]
+)
+SCRAPED_CANDIDATES = Counter(
+    "scraper_candidates_total", "Candidates saved.", ["account"]
+)
+SCRAPE_RETRIES = Counter(
+    "scraper_retries_total", "Offers retried with a new browser session.", ["account"]
+)
+SCRAPE_TIMEOUTS = Counter(
+    "scraper_timeouts_total", "Waits for a page that timed out.", ["account"]
+)
+
+
+def scrape_labels(account) -> dict:
+    """Labels of the per account counters, "none" outside of a job."""
+    return {"account": account or "none"}
+
+
+@contextmanager
+def observe_seconds(histogram, **labels):
+    """Observe the wall time of the block in a histogram, also when it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metric = histogram.labels(**labels) if labels else histogram
+        metric.observe(time.perf_counter() - started)
+
+
+def metrics_registry():
+    """
+    Registry to export, the one of this process or, when the
+    PROMETHEUS_MULTIPROC_DIR variable is set, the aggregate of every process
+    that writes its metrics to that directory.
+    """
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics():
+    """Return the metrics in the Prometheus text format."""
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
@@ -0,0 +1,113 @@
+import asyncio
+import functools
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+from .config import settings
+from .metrics import PACING_SLEEP_SECONDS
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking call (Selenium, file IO) in the default executor.
+
+    Keeps the event loop free for the API requests while a browser waits
+    for a page.
+    """
+    return await asyncio.to_thread(functools.partial(func, *args, **kwargs))
+
+
+class TokenBucket:
+    """ Token bucket that spaces out the requests sent to one domain.
+
+    Thread safe and not bound to an event loop, so the same bucket can be
+    shared by every scraping worker of the process.
+
+    Args:
+        rate (float): Tokens added per second.
+        capacity (int): Maximum burst of requests sent without waiting.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class Pacer:
+    """ Central pacing scheduler of the scraping requests.
+
+    Every request first waits for a token of its domain bucket and then,
+    if asked, for an extra jittered delay that mimics a human pause.
+    All the waits are awaited, never slept.
+
+    Args:
+        rate (float): Requests per second allowed per domain.
+        burst (int): Requests per domain sent without waiting.
+        page_pause (tuple): Minimum and maximum human pause before a page
+            navigation, see `wait_page`.
+    """
+
+    def __init__(self, rate: float, burst: int, page_pause: tuple = (0, 0)):
+        self.rate = rate
+        self.burst = burst
+        self.page_pause = page_pause
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, url: str) -> TokenBucket:
+        domain = urlparse(url).netloc or url
+        with self._lock:
+            if domain not in self._buckets:
+                self._buckets[domain] = TokenBucket(self.rate, self.burst)
+            return self._buckets[domain]
+
+    async def wait(self, url: str, min_delay: float = 0, max_delay: float = None):
+        """Wait for the turn of a request to `url`.
+
+        Args:
+            url (str): URL, or domain, of the request.
+            min_delay (float): Minimum extra pause in seconds.
+            max_delay (float): Maximum extra pause, defaults to `min_delay`.
+        """
+        delay = self._bucket(url).reserve()
+        if max_delay is None:
+            max_delay = min_delay
+        if max_delay > 0:
+            delay += random.uniform(min_delay, max_delay)
+        if delay > 0:
+            PACING_SLEEP_SECONDS.observe(delay)
+            await asyncio.sleep(delay)
+
+    async def wait_page(self, url: str):
+        """Wait for the turn of a page navigation, with the pause of the pacing policy."""
+        await self.wait(url, *self.page_pause)
+
+
+_pacer = None
+
+
+def get_pacer() -> Pacer:
+    """Return the process wide pacing scheduler."""
+    global _pacer
+    if _pacer is None:
+        _pacer = Pacer(
+            settings.SCRAPER_RATE_PER_SECOND,
+            settings.SCRAPER_RATE_BURST,
+            (settings.SCRAPER_PAGE_PAUSE_MIN, settings.SCRAPER_PAGE_PAUSE_MAX),
+        )
+    return _pacer
@@ -1,12 +1,20 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-import time
+
+from .config import settings
+from .logger_config import logger
 
 chrome_driver_path = "C:\\ruta\\a\\chromedriver.exe"  #windows
 chrome_driver_path = "C:\\SeleniumDrivers\\chromedriver.exe"  #linux
 
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.6778.109 Safari/537.36'
+
 # Configuración del navegador
 options = Options()
 options.add_argument('--headless')  # Opcional: Si no necesitas una ventana de navegador visible
@@ -15,15 +23,214 @@ options.add_argument("--disable-gpu")
 options.add_argument("--disable-software-rasterizer")
 options.add_argument('--disable-dev-shm-usage')
 options.add_argument("--disable-extensions")
-options.add_argument('--disable-blink-features=AutomationControlled') 
-options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.6778.109 Safari/537.36')  # Cambia el User-Agent
+options.add_argument('--disable-blink-features=AutomationControlled')
+options.add_argument(f'user-agent={USER_AGENT}')  # Cambia el User-Agent
+# driver.get vuelve con el DOM listo, los scrapers esperan solo los elementos que leen
+options.page_load_strategy = settings.SCRAPER_PAGE_LOAD_STRATEGY
 
 # options.binary_location = '/usr/bin/chromium-browser'
 
-# Inicializar WebDriver
-# driver = webdriver.Chrome(options=options)
+
+def _extension_patterns(*extensions):
+    """URL patterns of the files with these extensions, with or without query string."""
+    return tuple(
+        pattern
+        for extension in extensions
+        for pattern in (f"*.{extension}", f"*.{extension}?*")
+    )
+
+
+# Recursos que el scraping no necesita: solo se leen el HTML y el DOM
+IMAGE_PATTERNS = _extension_patterns("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp")
+FONT_PATTERNS = _extension_patterns("woff", "woff2", "ttf", "otf", "eot")
+MEDIA_PATTERNS = _extension_patterns("mp4", "webm", "mp3", "ogg", "wav", "m4a")
+STYLESHEET_PATTERNS = _extension_patterns("css")
+TRACKER_PATTERNS = (
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*googlesyndication.com*",
+    "*googleadservices.com*",
+    "*doubleclick.net*",
+    "*adservice.google.*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    "*clarity.ms*",
+    "*criteo.*",
+    "*taboola.com*",
+    "*nr-data.net*",
+)
+
+# Perfil de bloqueo -> patrones de URL que el navegador no descarga
+BLOCKING_PROFILES = {
+    "none": (),
+    "standard": IMAGE_PATTERNS + FONT_PATTERNS + MEDIA_PATTERNS + TRACKER_PATTERNS,
+    "aggressive": (
+        IMAGE_PATTERNS + FONT_PATTERNS + MEDIA_PATTERNS + TRACKER_PATTERNS + STYLESHEET_PATTERNS
+    ),
+}
 
 #windows
 # Inicializar WebDriver
 # service = Service(chrome_driver_path)
-driver = webdriver.Chrome(options=options)
+
+
+def create_driver():
+    """Create a new Chrome WebDriver session with the scraping options."""
+    return webdriver.Chrome(options=options)
+
+
+def apply_blocking_profile(driver, profile: str):
+    """
+    Block the requests of a resource blocking profile in a browser session.
+
+    Uses the Chrome DevTools protocol, so the profile can change every time
+    a pooled browser is handed to another job. `none` clears the blocked
+    URLs of the previous job.
+
+    Args:
+        driver: Instance of Selenium WebDriver.
+        profile (str): Key of BLOCKING_PROFILES.
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(BLOCKING_PROFILES[profile])})
+
+
+def _quit_driver(driver):
+    """Quit a browser session ignoring the errors of an already dead one."""
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.error(f"Error al cerrar el navegador: {e}")
+
+
+def _is_alive(driver):
+    """Check that the browser session still answers commands."""
+    try:
+        driver.window_handles
+        return True
+    except Exception:
+        return False
+
+
+class DriverPool:
+    """ Pool of WebDriver sessions shared by the scraping jobs.
+
+    Browsers are only started when a job asks for one, kept warm
+    between jobs and quit once they have been idle for `idle_timeout`
+    seconds. Every session is an independent Chrome instance, so each
+    one keeps its own cookies.
+
+    Args:
+        size (int): Maximum number of browser sessions alive at once.
+        idle_timeout (int): Seconds an unused browser is kept warm.
+    """
+
+    def __init__(self, size: int, idle_timeout: int):
+        self.size = max(1, size)
+        self.idle_timeout = idle_timeout
+        self._idle = []
+        self._semaphore = None
+        self._reaper = None
+
+    async def acquire(self, blocking: str = None):
+        """Hand out a warm browser session, starting one if none is free.
+
+        Args:
+            blocking (str): Resource blocking profile of the job, by default
+                SCRAPER_BLOCK_RESOURCES.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.size)
+        await self._semaphore.acquire()
+        self._start_reaper()
+
+        try:
+            driver = None
+            while self._idle and driver is None:
+                driver, _ = self._idle.pop()
+                if not await asyncio.to_thread(_is_alive, driver):
+                    logger.info("Descartando un navegador que ya no responde.")
+                    await asyncio.to_thread(_quit_driver, driver)
+                    driver = None
+
+            if driver is None:
+                logger.info("Iniciando un nuevo navegador...")
+                driver = await asyncio.to_thread(create_driver)
+        except Exception:
+            self._semaphore.release()
+            raise
+
+        try:
+            await asyncio.to_thread(
+                apply_blocking_profile, driver, blocking or settings.SCRAPER_BLOCK_RESOURCES
+            )
+        except Exception as e:
+            # Sin bloqueo la página carga igual, solo más lenta
+            logger.error(f"Error al aplicar el perfil de bloqueo de recursos: {e}")
+        return driver
+
+    def release(self, driver):
+        """Give a browser session back to the pool to keep it warm."""
+        self._idle.append((driver, time.monotonic()))
+        self._semaphore.release()
+
+    async def discard(self, driver):
+        """Quit a browser session that must not be reused and free its slot."""
+        try:
+            await asyncio.to_thread(_quit_driver, driver)
+        finally:
+            self._semaphore.release()
+
+    @asynccontextmanager
+    async def session(self, blocking: str = None):
+        """Borrow a browser session for the duration of the block."""
+        driver = await self.acquire(blocking)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def _start_reaper(self):
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_idle())
+
+    async def _reap_idle(self):
+        """Quit the browsers that stayed idle longer than the timeout."""
+        while True:
+            await asyncio.sleep(max(1, self.idle_timeout / 2))
+            now = time.monotonic()
+            expired = [entry for entry in self._idle if now - entry[1] >= self.idle_timeout]
+            for entry in expired:
+                self._idle.remove(entry)
+                await asyncio.to_thread(_quit_driver, entry[0])
+            if expired:
+                logger.info(f"Cerrados {len(expired)} navegadores inactivos.")
+
+    def close(self):
+        """Quit every idle browser session of the pool."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        while self._idle:
+            driver, _ = self._idle.pop()
+            _quit_driver(driver)
+
+
+_driver_pool = None
+
+
+def get_driver_pool() -> DriverPool:
+    """Return the process wide driver pool, creating it on first use."""
+    global _driver_pool
+    if _driver_pool is None:
+        _driver_pool = DriverPool(
+            settings.SCRAPER_POOL_SIZE,
+            settings.SCRAPER_DRIVER_IDLE_TIMEOUT,
+        )
+    return _driver_pool
+
+
+def close_driver_pool():
+    """Quit the browsers of the driver pool if it was ever created."""
+    if _driver_pool is not None:
+        _driver_pool.close()
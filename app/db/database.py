@@ -1,17 +1,30 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from ..core.config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
+ENGINE_OPTIONS = dict(
     pool_size=50,
     max_overflow=50,
     pool_timeout=30,
     pool_recycle=1800,
     connect_args={"connect_timeout": 10}, 
 )
+# El motor asíncrono abre sus propias conexiones, con un pool más pequeño
+ASYNC_ENGINE_OPTIONS = dict(
+    ENGINE_OPTIONS,
+    pool_size=settings.DB_ASYNC_POOL_SIZE,
+    max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
+)
+# SQLite (benchmarks y pruebas locales) no acepta estas opciones de pool
+if make_url(settings.DATABASE_URL).get_backend_name() == "sqlite":
+    ENGINE_OPTIONS = {}
+    ASYNC_ENGINE_OPTIONS = {}
+
+engine = create_engine(settings.DATABASE_URL, **ENGINE_OPTIONS)
 
 
 SessionLocal = sessionmaker(
@@ -20,6 +33,34 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Driver asíncrono equivalente a cada driver síncrono
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Translate a sync database URL to the async driver of the same database."""
+    url = make_url(database_url)
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    **ASYNC_ENGINE_OPTIONS,
+)
+
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
 def get_db():
@@ -31,4 +72,12 @@ def get_db():
         yield db
     finally:
         db.close()
-        
\ No newline at end of file
+
+
+async def get_async_db():
+    """
+    this function will return an async database session, used by the
+    endpoints that must not block the event loop
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -12,6 +12,10 @@ from alembic import context
 from app.db.database import Base
 from app.db.models.user import User
 from app.db.models.offer import Offer
+from app.db.models.candidate import Candidate
+from app.db.models.candidate_detail import CandidateDetail
+from app.db.models.scrape_job import ScrapeJob
+from app.db.models.scrape_checkpoint import ScrapeCheckpoint
 
 load_dotenv() 
 
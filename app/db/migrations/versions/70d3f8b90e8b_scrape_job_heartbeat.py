@@ -0,0 +1,24 @@
+"""scrape job heartbeat
+
+Revision ID: 70d3f8b90e8b
+Revises: f3c717c0eb66
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+
+# revision identifiers, used by Alembic.
+revision: str = '70d3f8b90e8b'
+down_revision: Union[str, None] = 'f3c717c0eb66'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Las columnas worker_id y heartbeat_at las crea b5d1e2a7c3f9
+    pass
+
+
+def downgrade() -> None:
+    pass
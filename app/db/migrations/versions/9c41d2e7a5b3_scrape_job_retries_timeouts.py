@@ -0,0 +1,24 @@
+"""scrape job retries and timeouts
+
+Revision ID: 9c41d2e7a5b3
+Revises: 70d3f8b90e8b
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c41d2e7a5b3'
+down_revision: Union[str, None] = '70d3f8b90e8b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Las columnas retries y timeouts las crea b5d1e2a7c3f9
+    pass
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,103 @@
+"""scrape jobs and checkpoints
+
+Revision ID: b5d1e2a7c3f9
+Revises: e75bd38a1cdb
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d1e2a7c3f9'
+down_revision: Union[str, None] = 'e75bd38a1cdb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _scrape_job_columns() -> list:
+    return [
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("account", sa.String(length=255), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="pending"),
+        sa.Column("offers", sa.JSON(), nullable=False),
+        sa.Column("incremental", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("resource_blocking", sa.String(length=20), nullable=True),
+        sa.Column("worker_id", sa.String(length=64), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(), nullable=True),
+        sa.Column("offers_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("offers_done", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("pages_done", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("candidates_saved", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("retries", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("timeouts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    ]
+
+
+def _scrape_checkpoint_columns() -> list:
+    return [
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("job_id", sa.Integer(), sa.ForeignKey("scrape_jobs.id"), nullable=False),
+        sa.Column("offer_url", sa.String(length=500), nullable=False),
+        sa.Column("last_page", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("saved_candidates", sa.JSON(), nullable=False),
+        sa.Column("completed", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    ]
+
+
+# (tabla, columnas, índices) con los nombres que usa SQLAlchemy para index=True
+TABLES = (
+    ("scrape_jobs", _scrape_job_columns, (
+        ("ix_scrape_jobs_id", ["id"]),
+        ("ix_scrape_jobs_account", ["account"]),
+        ("ix_scrape_jobs_status", ["status"]),
+    )),
+    ("scrape_checkpoints", _scrape_checkpoint_columns, (
+        ("ix_scrape_checkpoints_id", ["id"]),
+        ("ix_scrape_checkpoints_job_id", ["job_id"]),
+    )),
+)
+
+
+def _create_table(table: str, columns) -> None:
+    extra = []
+    if table == "scrape_checkpoints":
+        extra.append(sa.UniqueConstraint("job_id", "offer_url", name="uq_scrape_checkpoints_job_offer"))
+    op.create_table(table, *columns(), *extra)
+
+
+def _add_missing_columns(table: str, columns) -> None:
+    """Bring a table that the application created before this revision up to date."""
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns(table)}
+    for column in columns():
+        if column.name not in existing:
+            op.add_column(table, column)
+
+
+def upgrade() -> None:
+    for table, columns, indexes in TABLES:
+        if not sa.inspect(op.get_bind()).has_table(table):
+            _create_table(table, columns)
+        else:
+            _add_missing_columns(table, columns)
+
+        existing = {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+        for name, index_columns in indexes:
+            if name not in existing:
+                op.create_index(name, table, index_columns)
+
+
+def downgrade() -> None:
+    op.drop_table("scrape_checkpoints")
+    op.drop_table("scrape_jobs")
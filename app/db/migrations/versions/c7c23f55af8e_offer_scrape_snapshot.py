@@ -0,0 +1,35 @@
+"""offer scrape snapshot
+
+Revision ID: c7c23f55af8e
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7c23f55af8e'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _offer_columns() -> set:
+    return {column["name"] for column in sa.inspect(op.get_bind()).get_columns("offers")}
+
+
+def upgrade() -> None:
+    columns = _offer_columns()
+    if "scraped_applicants_count" not in columns:
+        op.add_column("offers", sa.Column("scraped_applicants_count", sa.Integer(), nullable=True))
+    if "scraped_last_update" not in columns:
+        op.add_column("offers", sa.Column("scraped_last_update", sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("offers", "scraped_last_update")
+    op.drop_column("offers", "scraped_applicants_count")
@@ -0,0 +1,93 @@
+"""unique keys and listing index
+
+Revision ID: e75bd38a1cdb
+Revises: c7c23f55af8e
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e75bd38a1cdb'
+down_revision: Union[str, None] = 'c7c23f55af8e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (tabla, columna, índice único)
+UNIQUE_KEYS = (
+    ("candidates", "uuid_candidate", "ix_candidates_uuid_candidate"),
+    ("candidate_details", "uuid_candidate", "ix_candidate_details_uuid_candidate"),
+    ("offers", "offer_id", "ix_offers_offer_id"),
+)
+
+
+def _indexes(table: str) -> dict:
+    return {index["name"]: index for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def _keep_latest(table: str, column: str) -> str:
+    """Ids of the rows to keep, the newest one of every `column` value.
+
+    The derived table lets MySQL read the table it deletes from.
+    """
+    return (
+        f"SELECT id FROM (SELECT MAX(id) AS id FROM {table} "
+        f"WHERE {column} IS NOT NULL GROUP BY {column}) AS keep_{table}"
+    )
+
+
+def _delete_duplicates(table: str, column: str) -> None:
+    op.execute(
+        f"DELETE FROM {table} WHERE {column} IS NOT NULL "
+        f"AND id NOT IN ({_keep_latest(table, column)})"
+    )
+
+
+def _repoint(table: str, foreign_key: str, parent: str, column: str) -> None:
+    """Point the rows that reference a duplicate to the row that is kept."""
+    op.execute(
+        f"UPDATE {table} SET {foreign_key} = ("
+        f"SELECT MAX(kept.id) FROM {parent} AS duplicate "
+        f"JOIN {parent} AS kept ON kept.{column} = duplicate.{column} "
+        f"WHERE duplicate.id = {table}.{foreign_key}) "
+        f"WHERE {foreign_key} IN (SELECT id FROM {parent} WHERE {column} IS NOT NULL)"
+    )
+
+
+def upgrade() -> None:
+    # Las filas repetidas vienen del guardado fila a fila anterior al upsert
+    _repoint("candidates", "offer_id", "offers", "offer_id")
+    _delete_duplicates("offers", "offer_id")
+    _repoint("candidate_details", "candidate_id", "candidates", "uuid_candidate")
+    _delete_duplicates("candidates", "uuid_candidate")
+    _delete_duplicates("candidate_details", "uuid_candidate")
+
+    for table, column, name in UNIQUE_KEYS:
+        index = _indexes(table).get(name)
+        if index is not None and index["unique"]:
+            continue
+        if index is not None:
+            op.drop_index(name, table_name=table)
+        op.create_index(name, table, [column], unique=True)
+
+    # (uuid_offer, id) cubre también las búsquedas solo por uuid_offer
+    candidate_indexes = _indexes("candidates")
+    if "ix_candidates_uuid_offer_id" not in candidate_indexes:
+        op.create_index("ix_candidates_uuid_offer_id", "candidates", ["uuid_offer", "id"])
+    if "ix_candidates_uuid_offer" in candidate_indexes:
+        op.drop_index("ix_candidates_uuid_offer", table_name="candidates")
+
+
+def downgrade() -> None:
+    op.create_index("ix_candidates_uuid_offer", "candidates", ["uuid_offer"])
+    op.drop_index("ix_candidates_uuid_offer_id", table_name="candidates")
+
+    for table, column, name in UNIQUE_KEYS:
+        op.drop_index(name, table_name=table)
+        if table != "offers":
+            op.create_index(name, table, [column])
@@ -0,0 +1,24 @@
+"""scrape job resource blocking
+
+Revision ID: f3c717c0eb66
+Revises: b5d1e2a7c3f9
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c717c0eb66'
+down_revision: Union[str, None] = 'b5d1e2a7c3f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # La columna resource_blocking la crea b5d1e2a7c3f9
+    pass
+
+
+def downgrade() -> None:
+    pass
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ...db.database import Base
@@ -13,6 +13,10 @@ class Candidate(Base):
         class 'models.Candidate': Candidate model
     """
     __tablename__ = "candidates"
+    __table_args__ = (
+        # Listado de candidatos de una oferta paginado por id
+        Index("ix_candidates_uuid_offer_id", "uuid_offer", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=True)
@@ -22,8 +26,8 @@ class Candidate(Base):
     suitability = Column(String(255), nullable=True)
     details_link = Column(String(255), nullable=True)
     offer_id = Column(Integer, ForeignKey("offers.id"), index=True, nullable=True)
-    uuid_offer = Column(String(255), nullable=True, index=True)
-    uuid_candidate = Column(String(255), index=True, nullable=True)
+    uuid_offer = Column(String(255), nullable=True)
+    uuid_candidate = Column(String(255), unique=True, index=True, nullable=True)
 
     offer = relationship("Offer", back_populates="candidates")
     
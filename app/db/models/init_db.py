@@ -4,6 +4,8 @@ from ..models.user import User
 from ..models.offer import Offer
 from ..models.candidate import Candidate
 from ..models.candidate_detail import CandidateDetail
+from ..models.scrape_job import ScrapeJob
+from ..models.scrape_checkpoint import ScrapeCheckpoint
 
 def init_db():
     """Create the database tables."""
@@ -15,7 +15,7 @@ class Offer(Base):
     __tablename__ = "offers"
 
     id = Column(Integer, primary_key=True, unique=True)
-    offer_id = Column(String(255), nullable=True)
+    offer_id = Column(String(255), unique=True, index=True, nullable=True)
     title = Column(String(255), nullable=True)
     location = Column(String(255), nullable=True)
     last_update = Column(String(255), nullable=True)
@@ -23,6 +23,9 @@ class Offer(Base):
     expiration_date = Column(String(255), nullable=True)
     applicants_count = Column(Integer, nullable=True)
     applicants_link = Column(String(255), nullable=True)  
+    # Valores de la oferta en el último scraping completo de sus candidatos
+    scraped_applicants_count = Column(Integer, nullable=True)
+    scraped_last_update = Column(String(255), nullable=True)
     created_at = Column(DateTime, default=datetime.now())
     updated_at = Column(DateTime, default=datetime.now(), onupdate=datetime.now())
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False) 
@@ -0,0 +1,26 @@
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, JSON, UniqueConstraint
+from datetime import datetime
+from ...db.database import Base
+
+class ScrapeCheckpoint(Base):
+    """ Scrape checkpoint model, progress of a job on one offer
+
+    Args:
+        Base (Base): Base clase de SQLAlchemy
+        
+    Returns:
+        class 'models.ScrapeCheckpoint': ScrapeCheckpoint model
+    """
+    __tablename__ = "scrape_checkpoints"
+    __table_args__ = (UniqueConstraint("job_id", "offer_url", name="uq_scrape_checkpoints_job_offer"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("scrape_jobs.id"), index=True, nullable=False)
+    offer_url = Column(String(500), nullable=False)
+    # Última página terminada y candidatos con detalles guardados de la página en curso
+    last_page = Column(Integer, nullable=False, default=0)
+    saved_candidates = Column(JSON, nullable=False, default=list)
+    completed = Column(Boolean, nullable=False, default=False)
+
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
@@ -0,0 +1,37 @@
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, JSON, Text
+from datetime import datetime
+from ...db.database import Base
+
+class ScrapeJob(Base):
+    """ Scrape job model, the persistent queue of scraping requests
+
+    Args:
+        Base (Base): Base clase de SQLAlchemy
+        
+    Returns:
+        class 'models.ScrapeJob': ScrapeJob model
+    """
+    __tablename__ = "scrape_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    account = Column(String(255), index=True, nullable=False)
+    status = Column(String(20), index=True, nullable=False, default="pending")
+    offers = Column(JSON, nullable=False)
+    incremental = Column(Boolean, nullable=False, default=False)
+    resource_blocking = Column(String(20), nullable=True)
+    # Proceso que ejecuta el trabajo y su último latido
+    worker_id = Column(String(64), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    offers_total = Column(Integer, nullable=False, default=0)
+    offers_done = Column(Integer, nullable=False, default=0)
+    pages_done = Column(Integer, nullable=False, default=0)
+    candidates_saved = Column(Integer, nullable=False, default=0)
+    retries = Column(Integer, nullable=False, default=0)
+    timeouts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
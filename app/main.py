@@ -1,15 +1,18 @@
 import logging
 
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Response
 from fastapi.responses import RedirectResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 
 from .core.config import settings
+from .core.metrics import render_metrics
 from .api.routers.base_router import base_router
 from .db.database import engine
 from .db.database import Base
 from .db.models.init_db import init_db
+from .core.selenium import close_driver_pool
+from .service.scrape_worker import get_worker_pool
 
 
 
@@ -46,8 +49,30 @@ app.add_middleware(
 init_db()
 app.include_router(base_router)
 
+
+@app.on_event("startup")
+async def start_scrape_workers():
+    """Start the scrape job workers inside the API process if enabled."""
+    if settings.SCRAPER_EMBEDDED_WORKERS:
+        await get_worker_pool().start()
+
+
+@app.on_event("shutdown")
+async def shutdown_scraping():
+    """Stop the scrape workers and quit the browsers kept warm by them."""
+    if settings.SCRAPER_EMBEDDED_WORKERS:
+        await get_worker_pool().stop()
+    close_driver_pool()
+
 # Endpoint de información general
 @app.get("/info")
 def read_root():
     return {
         "message": f" Hello, World! the app: {settings.APP_NAME} is Running in {settings.FASTAPI_ENV} mode."}
+
+
+# Métricas del scraping en formato Prometheus
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
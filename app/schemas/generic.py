@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Literal, Optional
 
 
 class GenericResponse(BaseModel):
@@ -11,6 +11,9 @@ class Offer(BaseModel):
 
 class OffersList(BaseModel):
     offers: List[Offer]
+    incremental: bool = False
+    # Recursos que el navegador no descarga, por defecto SCRAPER_BLOCK_RESOURCES
+    resource_blocking: Optional[Literal["none", "standard", "aggressive"]] = None
     
 # Respuestas comunes
 # common_responses = {
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ScrapeJobStatus(BaseModel):
+    id: int
+    status: str
+    offers_total: int
+    offers_done: int
+    pages_done: int
+    candidates_saved: int
+    retries: int = 0
+    timeouts: int = 0
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    elapsed_seconds: Optional[float] = None
+    pages_per_minute: Optional[float] = None
+    candidates_per_minute: Optional[float] = None
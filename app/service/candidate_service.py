@@ -1,16 +1,26 @@
-from datetime import datetime
+import csv
+import io
+import tempfile
+import time
+from datetime import datetime, timedelta
 from fastapi import HTTPException
 
 from sqlalchemy.orm import Session
-from sqlalchemy.dialects.mysql import insert
-from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy import exc, func, select
 
 from openpyxl import Workbook
 
 from ..db.models.candidate import Candidate
 from ..db.models.candidate_detail import CandidateDetail
-from ..db.database import SessionLocal
+from ..db.database import SessionLocal, AsyncSessionLocal
+from ..core.config import settings
 from ..core.logger_config import logger
+from ..core.metrics import DB_UPSERT_SECONDS, observe_seconds
+from ..utils.utils import drop_expired
 
 def create_candidate(db: Session, offer_id: str, candidate_data: dict):
     """
@@ -48,190 +58,465 @@ def create_candidate(db: Session, offer_id: str, candidate_data: dict):
     finally:
         db.close()
 
-async def _save_candidates_batch(candidates_batch: list):
+CANDIDATE_UPSERT_FIELDS = (
+    "name",
+    "application_date",
+    "age",
+    "education_level",
+    "suitability",
+    "details_link",
+    "uuid_offer",
+)
+
+
+# Dialecto -> INSERT con soporte de upsert
+DIALECT_INSERTS = {
+    "mariadb": mysql_insert,
+    "mysql": mysql_insert,
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+
+def _dialect_insert(dialect_name: str):
+    """
+    Return the dialect specific INSERT construct used for upserts.
+
+    Raises:
+        NotImplementedError: If the database has no supported upsert.
+    """
+    if dialect_name not in DIALECT_INSERTS:
+        raise NotImplementedError(f"El upsert de candidatos no soporta la base de datos {dialect_name}")
+    return DIALECT_INSERTS[dialect_name]
+
+
+def _upsert_candidates(db: Session, rows: list):
+    """
+    Insert or update candidate rows keyed on `uuid_candidate` in one statement.
+
+    The inserted/updated split comes from a select of the keys already
+    stored, since the affected-rows count of the upsert differs by engine.
+
+    Returns:
+        tuple: Number of inserted and updated rows.
+    """
+    dialect_name = db.get_bind().dialect.name
+    stmt = _dialect_insert(dialect_name)(Candidate).values(rows)
+    update_fields = CANDIDATE_UPSERT_FIELDS + ("updated_at",)
+
+    uuids = [row["uuid_candidate"] for row in rows]
+    updated = db.scalar(
+        select(func.count()).select_from(Candidate).where(Candidate.uuid_candidate.in_(uuids))
+    )
+
+    if dialect_name in ("mysql", "mariadb"):
+        stmt = stmt.on_duplicate_key_update(
+            {field: stmt.inserted[field] for field in update_fields}
+        )
+    else:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Candidate.uuid_candidate],
+            set_={field: stmt.excluded[field] for field in update_fields},
+        )
+    db.execute(stmt)
+    return len(rows) - updated, updated
+
+
+async def _save_candidates_batch(candidates_batch: list, db: Session = None):
+    """
+    Async version of `_write_candidates_batch`.
+
+    The batch is written through an async session, so the event loop keeps
+    serving requests during the database round trips. A sync `db` session
+    is used as is.
+    """
+    with observe_seconds(DB_UPSERT_SECONDS, table="candidates"):
+        if db is not None:
+            return _write_candidates_batch(candidates_batch, db)
+        async with AsyncSessionLocal() as session:
+            return await session.run_sync(
+                lambda sync_db: _write_candidates_batch(candidates_batch, sync_db)
+            )
+
+
+def _write_candidates_batch(candidates_batch: list, db: Session = None):
     """
     
     Save a batch of candidates to the database avoiding duplicates.
-    Updates existing records if they exist, or creates them if they don't.
+    Updates existing records if they exist, or creates them if they don't,
+    with a single upsert statement and a single commit for the whole batch.
     
 
     Args: 
         candidates_batch: List of candidate dictionaries.
-        db: Active database session.
+        db: Active database session. A new one is opened if not given.
+
+    Returns:
+        dict: Number of `inserted` and `updated` candidates, or None on error.
     """
-    db = SessionLocal()
+    own_session = db is None
+    if own_session:
+        db = SessionLocal()
     try:
+        now = datetime.now()
+        rows = {}
         for candidate in candidates_batch:
-            existing_candidate = db.query(Candidate).filter(Candidate.uuid_candidate == candidate['uuid_candidate']).first()
-            
-            if existing_candidate:
-                existing_candidate.name = candidate['name']
-                existing_candidate.application_date = candidate['application_date']
-                existing_candidate.age = candidate['age']
-                existing_candidate.education_level = candidate['education_level']
-                existing_candidate.suitability = candidate['suitability']
-                existing_candidate.details_link = candidate['details_link']
-                existing_candidate.uuid_offer = candidate['uuid_offer']
-                existing_candidate.updated_at = datetime.now()
-
-                db.commit()
-            else:
-                new_candidate = Candidate(
-                    name=candidate['name'],
-                    application_date=candidate['application_date'],
-                    age=candidate['age'],
-                    education_level=candidate['education_level'],
-                    suitability=candidate['suitability'],
-                    details_link=candidate['details_link'],
-                    uuid_offer=candidate['uuid_offer'],
-                    uuid_candidate=candidate['uuid_candidate'],
-                    created_at=datetime.now(),
-                    updated_at=datetime.now()
-                )
-                db.add(new_candidate)
-                db.commit()
-
-        logger.info(f"Guardado o actualizado un lote de {len(candidates_batch)} candidatos.")
+            if not candidate.get('uuid_candidate'):
+                logger.warning(f"Candidato sin identificador, no se guarda: {candidate.get('name')}")
+                continue
+            row = {field: candidate[field] for field in CANDIDATE_UPSERT_FIELDS}
+            row.update(
+                uuid_candidate=candidate['uuid_candidate'],
+                created_at=now,
+                updated_at=now,
+            )
+            # Si el lote repite un candidato se conserva la última versión
+            rows[candidate['uuid_candidate']] = row
+
+        if not rows:
+            return {"inserted": 0, "updated": 0}
+
+        inserted, updated = _upsert_candidates(db, list(rows.values()))
+        db.commit()
+
+        logger.info(
+            f"Guardado un lote de {len(rows)} candidatos: "
+            f"{inserted} insertados, {updated} actualizados."
+        )
+        return {"inserted": inserted, "updated": updated}
     except exc.SQLAlchemyError as e:
         db.rollback()
         logger.error(f"Error al guardar o actualizar el lote: {e}")
+        return None
+    finally:
+        if own_session:
+            db.close()
+
+
+CANDIDATE_DETAIL_FIELDS = (
+    "email",
+    "id_number",
+    "mobile_phone",
+    "landline_phone",
+    "location",
+    "marital_status",
+    "availability_to_travel",
+    "availability_to_move",
+    "net_monthly_salary",
+    "cv_link",
+)
+
+
+def get_known_candidates(uuid_offer: str, ttl_hours: int) -> dict:
+    """
+    Get the candidates already stored for an offer and whether their details are fresh.
+
+    Args:
+        uuid_offer: UUID of the offer.
+        ttl_hours: Hours after which stored details are considered stale.
+
+    Returns:
+        dict: `uuid_candidate` -> True if its details were updated within the TTL.
+    """
+    db = SessionLocal()
+    try:
+        fresh_since = datetime.now() - timedelta(hours=ttl_hours)
+        rows = (
+            db.query(Candidate.uuid_candidate, CandidateDetail.updated_at)
+            .outerjoin(CandidateDetail, CandidateDetail.uuid_candidate == Candidate.uuid_candidate)
+            .filter(Candidate.uuid_offer == uuid_offer)
+        )
+        return {
+            uuid_candidate: updated_at is not None and updated_at >= fresh_since
+            for uuid_candidate, updated_at in rows
+        }
     finally:
         db.close()
 
 
-async def save_candidate_details_batch(candidate_details_batch: list):
+async def save_candidate_details_batch(candidate_details_batch: list, db: Session = None):
+    """Async version of `_write_candidate_details_batch`, see `_save_candidates_batch`."""
+    with observe_seconds(DB_UPSERT_SECONDS, table="candidate_details"):
+        if db is not None:
+            return _write_candidate_details_batch(candidate_details_batch, db)
+        async with AsyncSessionLocal() as session:
+            return await session.run_sync(
+                lambda sync_db: _write_candidate_details_batch(candidate_details_batch, sync_db)
+            )
+
+
+def _write_candidate_details_batch(candidate_details_batch: list, db: Session = None):
     """
     Save a batch of candidate details to the database avoiding duplicates.
     Updates existing records if they exist, or creates them if they don't.
+    Existing rows are fetched with a single IN query and fields missing
+    from a details dictionary keep their stored value.
     
     Args:
         candidate_details_batch: List of candidate details dictionaries.
-        db: Active database session.
+        db: Active database session. A new one is opened if not given.
+
+    Returns:
+        bool: True if the batch was saved, False on error.
     """
-    db = SessionLocal()
+    own_session = db is None
+    if own_session:
+        db = SessionLocal()
     try:
-        for details in candidate_details_batch:
-            existing_details = db.query(CandidateDetail).filter(
-                CandidateDetail.uuid_candidate == details['uuid_candidate']
-            ).first()
-            
-            if existing_details:
+        # Los detalles vacíos corresponden a páginas que no se pudieron extraer
+        details_by_uuid = {
+            details['uuid_candidate']: details
+            for details in candidate_details_batch
+            if details.get('uuid_candidate')
+        }
+        if not details_by_uuid:
+            return True
+
+        existing_details = {
+            row.uuid_candidate: row
+            for row in db.query(CandidateDetail).filter(
+                CandidateDetail.uuid_candidate.in_(list(details_by_uuid))
+            )
+        }
+
+        now = datetime.now()
+        for uuid_candidate, details in details_by_uuid.items():
+            existing = existing_details.get(uuid_candidate)
+            if existing:
                 # Actualizar los campos existentes
-                existing_details.email = details.get("email", existing_details.email)
-                existing_details.id_number = details.get("id_number", existing_details.id_number)
-                existing_details.mobile_phone = details.get("mobile_phone", existing_details.mobile_phone)
-                existing_details.landline_phone = details.get("landline_phone", existing_details.landline_phone)
-                existing_details.location = details.get("location", existing_details.location)
-                existing_details.marital_status = details.get("marital_status", existing_details.marital_status)
-                existing_details.availability_to_travel = details.get(
-                    "availability_to_travel", existing_details.availability_to_travel
-                )
-                existing_details.availability_to_move = details.get(
-                    "availability_to_move", existing_details.availability_to_move
-                )
-                existing_details.net_monthly_salary = details.get(
-                    "net_monthly_salary", existing_details.net_monthly_salary
-                )
-                existing_details.cv_link = details.get("cv_link", existing_details.cv_link)
-                existing_details.updated_at = datetime.now()
+                for field in CANDIDATE_DETAIL_FIELDS:
+                    if field in details:
+                        setattr(existing, field, details[field])
+                existing.updated_at = now
             else:
                 # Crear un nuevo registro
-                new_details = CandidateDetail(
-                    email=details.get("email"),
-                    id_number=details.get("id_number"),
-                    mobile_phone=details.get("mobile_phone"),
-                    landline_phone=details.get("landline_phone"),
-                    location=details.get("location"),
-                    marital_status=details.get("marital_status"),
-                    availability_to_travel=details.get("availability_to_travel"),
-                    availability_to_move=details.get("availability_to_move"),
-                    net_monthly_salary=details.get("net_monthly_salary"),
+                db.add(CandidateDetail(
+                    **{field: details.get(field) for field in CANDIDATE_DETAIL_FIELDS},
                     resume=None,  # Lógica para extraer el resumen, si es necesario
-                    cv_link=details.get("cv_link"),
-                    uuid_candidate=details["uuid_candidate"],
-                    created_at=datetime.now(),
-                    updated_at=datetime.now(),
-                )
-                db.add(new_details)
+                    uuid_candidate=uuid_candidate,
+                    created_at=now,
+                    updated_at=now,
+                ))
 
         # Confirmar los cambios en un solo commit para todo el lote
         db.commit()
-        print(f"Guardado o actualizado un lote de {len(candidate_details_batch)} detalles de candidatos.")
+        logger.info(f"Guardado o actualizado un lote de {len(details_by_uuid)} detalles de candidatos.")
+        return True
     except Exception as e:
         db.rollback()
-        print(f"Error al guardar o actualizar el lote: {e}")
+        logger.error(f"Error al guardar o actualizar el lote: {e}")
+        return False
     finally:
-        db.close()
+        if own_session:
+            db.close()
+
+
+_total_candidates_cache = {}
+
+
+async def _count_candidates(db: AsyncSession, uuid_offer: str) -> int:
+    """Count the candidates of an offer, cached for CANDIDATES_COUNT_CACHE_TTL seconds."""
+    cached = _total_candidates_cache.get(uuid_offer)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+
+    total_candidates = await db.scalar(
+            select(func.count(Candidate.id))
+            .where(Candidate.uuid_offer == uuid_offer)
+        )
+    # Las ofertas que ya no se consultan no se quedan en la caché
+    drop_expired(_total_candidates_cache, time.monotonic())
+    _total_candidates_cache[uuid_offer] = (
+        total_candidates,
+        time.monotonic() + settings.CANDIDATES_COUNT_CACHE_TTL,
+    )
+    return total_candidates
+
+
+def _serialize_candidate(candidate: Candidate, candidate_details: CandidateDetail) -> dict:
+    return {
+        "id": candidate.id,
+        "name": candidate.name,
+        "application_date": candidate.application_date,
+        "age": candidate.age,
+        "education_level": candidate.education_level,
+        "suitability": candidate.suitability,
+        "details_link": candidate.details_link,
+        "uuid_offer": candidate.uuid_offer,
+        "uuid_candidate": candidate.uuid_candidate,
+        "details": {
+            "email": candidate_details.email if candidate_details else None,
+            "id_number": candidate_details.id_number if candidate_details else None,
+            "mobile_phone": candidate_details.mobile_phone if candidate_details else None,
+            "landline_phone": candidate_details.landline_phone if candidate_details else None,
+            "location": candidate_details.location if candidate_details else None,
+            "marital_status": candidate_details.marital_status if candidate_details else None,
+            "availability_to_travel": candidate_details.availability_to_travel if candidate_details else None,
+            "availability_to_move": candidate_details.availability_to_move if candidate_details else None,
+            "net_monthly_salary": candidate_details.net_monthly_salary if candidate_details else None,
+            "languages": candidate_details.languages if candidate_details else None,
+            "resume": candidate_details.resume if candidate_details else None,
+            "cv_link": candidate_details.cv_link if candidate_details else None,
+        },
+    }
 
 
 async def get_candidates_by_offer(
     uuid_offer: str,
-    db: Session,
+    db: AsyncSession,
     page: int = 1,
     page_size: int = 10,
+    cursor: int = None,
+    include_total: bool = True,
     ):
-    """ Get all candidates of an offer with pagination, along with their details. """
-    
-    offset = (page - 1) * page_size
-    candidates = (
-            db.query(Candidate)
-            .filter(Candidate.uuid_offer == uuid_offer)
-            .offset(offset)
-            .limit(page_size)
-            .all()
+    """ Get all candidates of an offer with pagination, along with their details.
+
+    Candidates and details are loaded with a single joined query. When a
+    `cursor` (the last `Candidate.id` already seen) is given the page is
+    fetched with keyset pagination and `page` is ignored.
+
+    Args:
+        uuid_offer: UUID of the offer.
+        db: Async database session.
+        page: Page number for OFFSET pagination.
+        page_size: Number of candidates per page.
+        cursor: `next_cursor` of the previous page for keyset pagination.
+        include_total: Whether to return the (cached) total of candidates.
+    """
+    query = (
+            select(Candidate, CandidateDetail)
+            .outerjoin(CandidateDetail, CandidateDetail.uuid_candidate == Candidate.uuid_candidate)
+            .where(Candidate.uuid_offer == uuid_offer)
+            .order_by(Candidate.id)
         )
+    if cursor is not None:
+        query = query.where(Candidate.id > cursor)
+    else:
+        query = query.offset((page - 1) * page_size)
+
+    rows = (await db.execute(query.limit(page_size))).all()
 
-    if not candidates:
+    if not rows:
         raise HTTPException(
             status_code=404, 
             detail="No se encontraron candidatos para esta oferta."
         )
 
-    total_candidates = (
-            db.query(Candidate)
-            .filter(Candidate.uuid_offer == uuid_offer)
-            .count()
-        )
+    response = [_serialize_candidate(candidate, details) for candidate, details in rows]
+    next_cursor = rows[-1][0].id if len(rows) == page_size else None
 
-    response = []
-    for candidate in candidates:
-        candidate_details = (
-            db.query(CandidateDetail)
-            .filter(CandidateDetail.uuid_candidate == candidate.uuid_candidate)
-            .first()
-        )
-
-        candidate_data = {
-                "id": candidate.id,
-                "name": candidate.name,
-                "application_date": candidate.application_date,
-                "age": candidate.age,
-                "education_level": candidate.education_level,
-                "suitability": candidate.suitability,
-                "details_link": candidate.details_link,
-                "uuid_offer": candidate.uuid_offer,
-                "uuid_candidate": candidate.uuid_candidate,
-                "details": {
-                    "email": candidate_details.email if candidate_details else None,
-                    "id_number": candidate_details.id_number if candidate_details else None,
-                    "mobile_phone": candidate_details.mobile_phone if candidate_details else None,
-                    "landline_phone": candidate_details.landline_phone if candidate_details else None,
-                    "location": candidate_details.location if candidate_details else None,
-                    "marital_status": candidate_details.marital_status if candidate_details else None,
-                    "availability_to_travel": candidate_details.availability_to_travel if candidate_details else None,
-                    "availability_to_move": candidate_details.availability_to_move if candidate_details else None,
-                    "net_monthly_salary": candidate_details.net_monthly_salary if candidate_details else None,
-                    "languages": candidate_details.languages if candidate_details else None,
-                    "resume": candidate_details.resume if candidate_details else None,
-                    "cv_link": candidate_details.cv_link if candidate_details else None,
-                },
-            }
-        response.append(candidate_data)
+    total_candidates = await _count_candidates(db, uuid_offer) if include_total else None
+    total_pages = (
+        (total_candidates + page_size - 1) // page_size if include_total else None
+    )
 
     return {
-            "page": page,
+            "page": page if cursor is None else None,
             "page_size": page_size,
+            "cursor": cursor,
+            "next_cursor": next_cursor,
             "total_candidates": total_candidates,
-            "total_pages": (total_candidates + page_size - 1) // page_size,
+            "total_pages": total_pages,
             "candidates": response,
         }
+
+
+EXPORT_HEADERS = [
+    "Nombre", "Fecha de Aplicación", "Edad", "Nivel Educativo", "Adecuación",
+    "Email", "ID Número", "Teléfono Móvil", "Teléfono Fijo", "Ubicación",
+    "Estado Civil", "Disponibilidad para Viajar", "Disponibilidad para Mudarse",
+    "Salario Mensual Neto", "Idiomas", "CV Link"
+]
+
+EXPORT_COLUMNS = (
+    Candidate.name,
+    Candidate.application_date,
+    Candidate.age,
+    Candidate.education_level,
+    Candidate.suitability,
+    CandidateDetail.email,
+    CandidateDetail.id_number,
+    CandidateDetail.mobile_phone,
+    CandidateDetail.landline_phone,
+    CandidateDetail.location,
+    CandidateDetail.marital_status,
+    CandidateDetail.availability_to_travel,
+    CandidateDetail.availability_to_move,
+    CandidateDetail.net_monthly_salary,
+    CandidateDetail.languages,
+    CandidateDetail.cv_link,
+)
+
+EXPORT_CHUNK_SIZE = 1000
+
+
+async def offer_has_candidates(db: AsyncSession, uuid_offer: str) -> bool:
+    """Check whether an offer has at least one stored candidate."""
+    candidate_id = await db.scalar(
+        select(Candidate.id).where(Candidate.uuid_offer == uuid_offer).limit(1)
+    )
+    return candidate_id is not None
+
+
+def _iter_export_rows(db: Session, uuid_offer: str):
+    """Yield the export rows of an offer through a server-side cursor."""
+    stmt = (
+        select(*EXPORT_COLUMNS)
+        .outerjoin(CandidateDetail, CandidateDetail.uuid_candidate == Candidate.uuid_candidate)
+        .where(Candidate.uuid_offer == uuid_offer)
+        .order_by(Candidate.id)
+        .execution_options(stream_results=True, yield_per=EXPORT_CHUNK_SIZE)
+    )
+    for row in db.execute(stmt):
+        yield list(row)
+
+
+def stream_candidates_csv(uuid_offer: str):
+    """
+    Stream the candidates of an offer as CSV, in chunks of EXPORT_CHUNK_SIZE rows.
+
+    Opens its own session because the response is consumed after the
+    request dependencies have been closed.
+    """
+    db = SessionLocal()
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        # BOM para que Excel reconozca los acentos
+        buffer.write("\ufeff")
+        writer.writerow(EXPORT_HEADERS)
+
+        for index, row in enumerate(_iter_export_rows(db, uuid_offer), start=1):
+            writer.writerow(row)
+            if index % EXPORT_CHUNK_SIZE == 0:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue().encode("utf-8")
+    finally:
+        db.close()
+
+
+def stream_candidates_xlsx(uuid_offer: str, chunk_size: int = 64 * 1024):
+    """
+    Stream the candidates of an offer as an Excel file.
+
+    Rows are written with an openpyxl write-only workbook into an anonymous
+    temporary file, which is removed as soon as the download finishes.
+    """
+    db = SessionLocal()
+    try:
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Candidatos")
+        sheet.append(EXPORT_HEADERS)
+        for row in _iter_export_rows(db, uuid_offer):
+            sheet.append(row)
+    finally:
+        db.close()
+
+    with tempfile.TemporaryFile(suffix=".xlsx") as temp_file:
+        workbook.save(temp_file)
+        temp_file.seek(0)
+        while chunk := temp_file.read(chunk_size):
+            yield chunk
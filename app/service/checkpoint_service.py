@@ -0,0 +1,100 @@
+from ..core.logger_config import logger
+from ..db.database import SessionLocal
+from ..db.models.scrape_checkpoint import ScrapeCheckpoint
+
+
+def _get_or_create(db, job_id: int, offer_url: str) -> ScrapeCheckpoint:
+    checkpoint = (
+        db.query(ScrapeCheckpoint)
+        .filter(ScrapeCheckpoint.job_id == job_id, ScrapeCheckpoint.offer_url == offer_url)
+        .first()
+    )
+    if checkpoint is None:
+        checkpoint = ScrapeCheckpoint(
+            job_id=job_id, offer_url=offer_url, last_page=0, saved_candidates=[], completed=False
+        )
+        db.add(checkpoint)
+    return checkpoint
+
+
+def _update_checkpoint(job_id: int, offer_url: str, **changes):
+    if job_id is None:
+        return
+    db = SessionLocal()
+    try:
+        checkpoint = _get_or_create(db, job_id, offer_url)
+        for field, value in changes.items():
+            setattr(checkpoint, field, value(checkpoint) if callable(value) else value)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error al guardar el checkpoint de {offer_url}: {e}")
+    finally:
+        db.close()
+
+
+def get_checkpoint(job_id: int, offer_url: str) -> dict:
+    """
+    Get where a job stopped on an offer.
+
+    Returns:
+        dict: `last_page` finished, `saved_candidates` of the pages in progress
+        and whether the offer was `completed`.
+    """
+    empty = {"last_page": 0, "saved_candidates": set(), "completed": False}
+    if job_id is None:
+        return empty
+    db = SessionLocal()
+    try:
+        checkpoint = (
+            db.query(ScrapeCheckpoint)
+            .filter(ScrapeCheckpoint.job_id == job_id, ScrapeCheckpoint.offer_url == offer_url)
+            .first()
+        )
+        if checkpoint is None:
+            return empty
+        return {
+            "last_page": checkpoint.last_page,
+            "saved_candidates": set(checkpoint.saved_candidates or []),
+            "completed": checkpoint.completed,
+        }
+    finally:
+        db.close()
+
+
+def save_details_checkpoint(job_id: int, offer_url: str, uuid_candidates: list):
+    """Record the candidates whose details were saved on the pages in progress."""
+    _update_checkpoint(
+        job_id,
+        offer_url,
+        saved_candidates=lambda checkpoint: sorted(
+            set(checkpoint.saved_candidates or []) | set(uuid_candidates)
+        ),
+    )
+
+
+def save_page_checkpoint(job_id: int, offer_url: str, page: int, uuid_candidates: list = None):
+    """
+    Record that a page of the offer was finished.
+
+    Args:
+        uuid_candidates: Candidates of the finished page. Only they are
+            dropped from `saved_candidates`, the details of the next pages
+            may already be saved. Every candidate is dropped when not given.
+    """
+    if uuid_candidates is None:
+        _update_checkpoint(job_id, offer_url, last_page=page, saved_candidates=[])
+        return
+    _update_checkpoint(
+        job_id,
+        offer_url,
+        last_page=page,
+        saved_candidates=lambda checkpoint: sorted(
+            set(checkpoint.saved_candidates or []) - set(uuid_candidates)
+        ),
+    )
+
+
+def complete_offer_checkpoint(job_id: int, offer_url: str):
+    """Record that every page of the offer was processed."""
+    _update_checkpoint(job_id, offer_url, completed=True, saved_candidates=[])
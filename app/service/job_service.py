@@ -0,0 +1,261 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from ..core.logger_config import logger
+from ..db.database import SessionLocal
+from ..db.models.scrape_job import ScrapeJob
+from ..schemas.scrape_job_schema import ScrapeJobStatus
+
+
+def create_scrape_job(
+    db: Session,
+    user_id: int,
+    account: str,
+    offers: list,
+    incremental: bool = False,
+    resource_blocking: str = None,
+) -> ScrapeJob:
+    """Queue a new scrape job for the given offer URLs.
+
+    Args:
+        db (Session): The database session.
+        user_id (int): ID of the user that requested the scrape.
+        account (str): Computrabajo account used to log in.
+        offers (list): URLs of the offers to scrape.
+        incremental (bool): Only fetch new or stale candidates.
+        resource_blocking (str): Resource blocking profile of the browsers,
+            None for SCRAPER_BLOCK_RESOURCES.
+
+    Returns:
+        ScrapeJob
+    """
+    job = ScrapeJob(
+        user_id=user_id,
+        account=account,
+        status="pending",
+        offers=offers,
+        incremental=incremental,
+        resource_blocking=resource_blocking,
+        offers_total=len(offers),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    logger.info(f"Trabajo de scraping {job.id} encolado con {len(offers)} ofertas.")
+    return job
+
+
+def _running_jobs(account: str):
+    """Count of the running jobs of an account, wrapped in a derived table so
+    MySQL accepts it in an UPDATE of the same table."""
+    running = (
+        select(ScrapeJob.id)
+        .where(ScrapeJob.account == account, ScrapeJob.status == "running")
+        .subquery()
+    )
+    return select(func.count()).select_from(running).scalar_subquery()
+
+
+def _claim_job(db: Session, job_id: int, account: str, max_jobs_per_account: int, worker_id: str) -> bool:
+    """Mark a pending job as running only while its account is under the limit."""
+    now = datetime.now()
+    claimed = db.execute(
+        update(ScrapeJob)
+        .where(
+            ScrapeJob.id == job_id,
+            ScrapeJob.status == "pending",
+            _running_jobs(account) < max_jobs_per_account,
+        )
+        .values(
+            status="running",
+            worker_id=worker_id,
+            heartbeat_at=now,
+            started_at=func.coalesce(ScrapeJob.started_at, now),
+            # Al reanudar, cada oferta se vuelve a contar cuando su checkpoint termina
+            offers_done=0,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    if claimed != 1:
+        return False
+
+    # Dos procesos pudieron reclamar a la vez trabajos de la misma cuenta: el
+    # último en confirmar ve al otro y devuelve el suyo a la cola
+    if db.scalar(select(_running_jobs(account))) > max_jobs_per_account:
+        db.execute(
+            update(ScrapeJob)
+            .where(ScrapeJob.id == job_id, ScrapeJob.worker_id == worker_id)
+            .values(status="pending", worker_id=None, heartbeat_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return False
+    return True
+
+
+def claim_next_job(db: Session, max_jobs_per_account: int, worker_id: str):
+    """Mark the oldest pending job as running and return it.
+
+    Jobs of accounts that already run `max_jobs_per_account` jobs are left
+    in the queue. The claim is a conditional UPDATE that only succeeds while
+    the job is still pending and its account under the limit, checked again
+    after the commit, so several worker processes can poll the same table
+    on any database. The job is owned by `worker_id` until its heartbeat
+    goes stale.
+
+    Returns:
+        ScrapeJob | None: The claimed job, or None if nothing can run now.
+    """
+    pending_jobs = (
+        db.query(ScrapeJob.id, ScrapeJob.account)
+        .filter(ScrapeJob.status == "pending")
+        .order_by(ScrapeJob.id)
+        .all()
+    )
+    db.rollback()
+
+    tried_accounts = set()
+    for job_id, account in pending_jobs:
+        # Solo el trabajo más antiguo de cada cuenta puede ejecutarse primero
+        if account in tried_accounts:
+            continue
+        tried_accounts.add(account)
+        if _claim_job(db, job_id, account, max_jobs_per_account, worker_id):
+            return db.get(ScrapeJob, job_id)
+    return None
+
+
+def record_job_progress(
+    job_id: int, pages: int = 0, candidates: int = 0, offers: int = 0, retries: int = 0, timeouts: int = 0
+):
+    """Atomically add the work done by a scraping worker, and its retries and timeouts, to a job."""
+    if job_id is None:
+        return
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(ScrapeJob)
+            .where(ScrapeJob.id == job_id)
+            .values(
+                pages_done=ScrapeJob.pages_done + pages,
+                candidates_saved=ScrapeJob.candidates_saved + candidates,
+                offers_done=ScrapeJob.offers_done + offers,
+                retries=ScrapeJob.retries + retries,
+                timeouts=ScrapeJob.timeouts + timeouts,
+                updated_at=datetime.now(),
+            )
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error al registrar el progreso del trabajo {job_id}: {e}")
+    finally:
+        db.close()
+
+
+def finish_job(job_id: int, error: str = None):
+    """Mark a job as done, or as failed when an error message is given."""
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(ScrapeJob)
+            .where(ScrapeJob.id == job_id)
+            .values(
+                status="failed" if error else "done",
+                error=error,
+                finished_at=datetime.now(),
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def beat_jobs(worker_id: str):
+    """Refresh the heartbeat of the jobs a worker process is running."""
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(ScrapeJob)
+            .where(ScrapeJob.status == "running", ScrapeJob.worker_id == worker_id)
+            .values(heartbeat_at=datetime.now())
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error al registrar el latido de los trabajos: {e}")
+    finally:
+        db.close()
+
+
+def requeue_interrupted_jobs(db: Session, stale_after: int) -> int:
+    """Put back in the queue the running jobs whose process stopped beating.
+
+    Jobs whose heartbeat is more recent than `stale_after` seconds belong
+    to a live process, possibly another API or worker process, and are
+    left alone.
+    """
+    stale_since = datetime.now() - timedelta(seconds=stale_after)
+    requeued = (
+        db.query(ScrapeJob)
+        .filter(
+            ScrapeJob.status == "running",
+            (ScrapeJob.heartbeat_at.is_(None)) | (ScrapeJob.heartbeat_at < stale_since),
+        )
+        .update(
+            {ScrapeJob.status: "pending", ScrapeJob.worker_id: None},
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    if requeued:
+        logger.info(f"Reencolados {requeued} trabajos de scraping interrumpidos.")
+    return requeued
+
+
+def resume_job(db: Session, job: ScrapeJob) -> ScrapeJob:
+    """Queue again a failed job, it resumes from its checkpoints."""
+    job.status = "pending"
+    job.error = None
+    job.finished_at = None
+    db.commit()
+    db.refresh(job)
+    logger.info(f"Trabajo de scraping {job.id} encolado para reanudarse.")
+    return job
+
+
+def get_job(db: Session, job_id: int, account: str):
+    """Get a scrape job of an account."""
+    return (
+        db.query(ScrapeJob)
+        .filter(ScrapeJob.id == job_id, ScrapeJob.account == account)
+        .first()
+    )
+
+
+def get_job_status(job: ScrapeJob) -> ScrapeJobStatus:
+    """Build the progress report of a job, including its throughput."""
+    status = ScrapeJobStatus(
+        id=job.id,
+        status=job.status,
+        offers_total=job.offers_total,
+        offers_done=job.offers_done,
+        pages_done=job.pages_done,
+        candidates_saved=job.candidates_saved,
+        retries=job.retries or 0,
+        timeouts=job.timeouts or 0,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+    if job.started_at:
+        elapsed = ((job.finished_at or datetime.now()) - job.started_at).total_seconds()
+        status.elapsed_seconds = elapsed
+        if elapsed > 0:
+            status.pages_per_minute = round(job.pages_done * 60 / elapsed, 2)
+            status.candidates_per_minute = round(job.candidates_saved * 60 / elapsed, 2)
+    return status
@@ -1,12 +1,33 @@
+import math
+
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from datetime import datetime
 from ..core.logger_config import logger
+from ..core.metrics import DB_UPSERT_SECONDS, observe_seconds
 from ..db.models.offer import Offer
 from ..db.models.user import User
+from ..db.database import SessionLocal, AsyncSessionLocal
+from .candidate_service import _dialect_insert
 
 
 async def create_offer(db: Session, user_id: int, offer_data: dict):
-    """Crea o actualiza una oferta en la base de datos."""
+    """
+    Crea o actualiza una oferta en la base de datos.
+
+    Without a sync `db` session the offer is written through an async
+    session, so the event loop is not blocked by the database.
+    """
+    if db is not None:
+        return _write_offer(db, user_id, offer_data)
+    async with AsyncSessionLocal() as session:
+        return await session.run_sync(
+            lambda sync_db: _write_offer(sync_db, user_id, offer_data)
+        )
+
+
+def _write_offer(db: Session, user_id: int, offer_data: dict):
+    """Crea o actualiza una oferta con una sesión síncrona."""
     try:
         # Verificar si la oferta ya existe en la base de datos
         existing_offer = db.query(Offer).filter(Offer.offer_id == offer_data["offer_id"]).first()
@@ -48,3 +69,182 @@ async def create_offer(db: Session, user_id: int, offer_data: dict):
         # Log error if something goes wrong during offer creation or update
         logger.error(f"Error al crear o actualizar la oferta: {e}")
         return None
+
+
+OFFER_UPSERT_FIELDS = (
+    "title",
+    "location",
+    "last_update",
+    "views",
+    "expiration_date",
+    "applicants_count",
+    "applicants_link",
+    "status",
+)
+
+
+def _upsert_offers(db: Session, rows: list):
+    """Insert or update offer rows keyed on `offer_id` in one statement."""
+    dialect_name = db.get_bind().dialect.name
+    stmt = _dialect_insert(dialect_name)(Offer).values(rows)
+    update_fields = OFFER_UPSERT_FIELDS + ("updated_at",)
+
+    if dialect_name == "mysql":
+        stmt = stmt.on_duplicate_key_update(
+            {field: stmt.inserted[field] for field in update_fields}
+        )
+    else:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Offer.offer_id],
+            set_={field: stmt.excluded[field] for field in update_fields},
+        )
+    db.execute(stmt)
+
+
+def _write_offers_batch(offers_batch: list, user_id: int, db: Session = None):
+    """
+    Save a batch of offers of the listing with a single upsert and commit.
+
+    Offers without an ID are skipped, and when a batch repeats an offer
+    the last version is kept. Counts such as '1.234' are stored as ints.
+
+    Args:
+        offers_batch: Offer dictionaries as returned by `parse_offer_listing`.
+        user_id: ID of the user that owns new offers.
+        db: Active database session. A new one is opened if not given.
+
+    Returns:
+        int: Number of offers saved, or None on error.
+    """
+    own_session = db is None
+    if own_session:
+        db = SessionLocal()
+    try:
+        now = datetime.now()
+        rows = {}
+        for offer_data in offers_batch:
+            offer_id = offer_data.get("offer_id")
+            if not offer_id or offer_id == "ID no encontrado":
+                logger.warning(f"Oferta sin identificador, no se guarda: {offer_data.get('title')}")
+                continue
+            rows[offer_id] = {
+                "offer_id": offer_id,
+                "title": offer_data["title"],
+                "location": offer_data["location"],
+                "last_update": offer_data["date_updated"],
+                "views": _parse_count(offer_data["views"]),
+                "expiration_date": offer_data["expiration_date"],
+                "applicants_count": _parse_count(offer_data["applicants"]),
+                "applicants_link": offer_data["applicants_link"],
+                "status": offer_data["status"],
+                "user_id": user_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+
+        if not rows:
+            return 0
+
+        _upsert_offers(db, list(rows.values()))
+        db.commit()
+        logger.info(f"Guardado un lote de {len(rows)} ofertas.")
+        return len(rows)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error al guardar el lote de ofertas: {e}")
+        return None
+    finally:
+        if own_session:
+            db.close()
+
+
+async def save_offers_batch(offers_batch: list, user_id: int, db: Session = None):
+    """Async version of `_write_offers_batch`, written through an async session."""
+    with observe_seconds(DB_UPSERT_SECONDS, table="offers"):
+        if db is not None:
+            return _write_offers_batch(offers_batch, user_id, db)
+        async with AsyncSessionLocal() as session:
+            return await session.run_sync(
+                lambda sync_db: _write_offers_batch(offers_batch, user_id, sync_db)
+            )
+
+
+def _parse_count(value):
+    """Convert an applicants count stored as text ('1.234') to an int."""
+    if value is None:
+        return None
+    digits = "".join(character for character in str(value) if character.isdigit())
+    return int(digits) if digits else None
+
+
+def offer_snapshot(offer_data: dict) -> dict:
+    """Applicants count and last update text of an offer as read from the offers listing."""
+    return {
+        "applicants_count": _parse_count(offer_data.get("applicants")),
+        "last_update": offer_data.get("date_updated"),
+    }
+
+
+def plan_offer_scrape(offer_id: str, page_size: int, snapshot: dict):
+    """
+    Decide how much of the candidates listing of an offer has to be scraped.
+
+    Compares the applicants count and last update text read from the offers
+    listing for this job with the values saved after the last complete
+    candidates scrape.
+
+    Args:
+        offer_id: ID of the offer (parameter 'oi').
+        page_size: Number of candidates per listing page.
+        snapshot: Live values of the offer, see `offer_snapshot`. None when
+            the offer was not found in the listing.
+
+    Returns:
+        tuple: (skip, max_pages). `skip` is True when nothing changed;
+        `max_pages` limits the pages to visit, None means all of them.
+    """
+    if snapshot is None or snapshot["applicants_count"] is None:
+        return False, None
+
+    db = SessionLocal()
+    try:
+        offer = db.query(Offer).filter(Offer.offer_id == offer_id).first()
+    finally:
+        db.close()
+
+    if offer is None or offer.scraped_applicants_count is None:
+        return False, None
+
+    new_applicants = snapshot["applicants_count"] - offer.scraped_applicants_count
+    if new_applicants <= 0 and snapshot["last_update"] == offer.scraped_last_update:
+        return True, None
+    if new_applicants > 0:
+        return False, math.ceil(new_applicants / page_size)
+    return False, None
+
+
+def mark_offer_scraped(offer_id: str, snapshot: dict):
+    """
+    Save the values seen in the offers listing before a complete scrape as its snapshot.
+
+    The values are the ones read by this job, not the columns of the offer,
+    which may not have been refreshed since the offers were last listed.
+    """
+    if snapshot is None:
+        return
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(Offer)
+            .where(Offer.offer_id == offer_id)
+            .values(
+                scraped_applicants_count=snapshot["applicants_count"],
+                scraped_last_update=snapshot["last_update"],
+            )
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error al guardar el estado de la oferta {offer_id}: {e}")
+    finally:
+        db.close()
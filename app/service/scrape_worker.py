@@ -0,0 +1,137 @@
+import asyncio
+import os
+import socket
+import traceback
+import uuid
+
+from ..core.config import settings
+from ..core.logger_config import logger
+from ..db.database import SessionLocal
+from ..db.models.user import User
+from ..schemas.generic import OffersList
+from .job_service import beat_jobs, claim_next_job, finish_job, requeue_interrupted_jobs
+from .selenium_service import flujo_principal
+
+
+def _requeue_stale_jobs():
+    db = SessionLocal()
+    try:
+        return requeue_interrupted_jobs(db, settings.SCRAPER_JOB_STALE_AFTER)
+    finally:
+        db.close()
+
+
+def _claim_job(worker_id):
+    db = SessionLocal()
+    try:
+        job = claim_next_job(db, settings.SCRAPER_MAX_JOBS_PER_ACCOUNT, worker_id)
+        if job is None:
+            return None
+        user = db.query(User).filter(User.id == job.user_id).first()
+        return (
+            job.id,
+            job.account,
+            user.password if user else None,
+            list(job.offers),
+            job.incremental,
+            job.resource_blocking,
+        )
+    finally:
+        db.close()
+
+
+async def run_job(
+    job_id: int,
+    account: str,
+    password: str,
+    offers: list,
+    incremental: bool,
+    resource_blocking: str = None,
+):
+    """Run one claimed scrape job and record how it ended."""
+    logger.info(f"Iniciando el trabajo de scraping {job_id} de la cuenta {account}")
+    try:
+        list_offers = OffersList(
+            offers=[{"url": url} for url in offers],
+            incremental=incremental,
+            resource_blocking=resource_blocking,
+        )
+        await flujo_principal(None, account, password, list_offers, job_id=job_id)
+    except Exception as e:
+        logger.error(f"El trabajo de scraping {job_id} falló: {e}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        await asyncio.to_thread(finish_job, job_id, str(e))
+        return
+    await asyncio.to_thread(finish_job, job_id)
+    logger.info(f"Trabajo de scraping {job_id} terminado.")
+
+
+class ScrapeWorkerPool:
+    """ Workers that take scrape jobs from the `scrape_jobs` queue.
+
+    Args:
+        workers (int): Number of jobs processed at the same time.
+        poll_interval (int): Seconds to wait when the queue is empty.
+    """
+
+    def __init__(self, workers: int, poll_interval: int):
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        # Identifica los trabajos de este proceso entre todos los que leen la cola
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tasks = []
+
+    async def start(self):
+        """Requeue the jobs of stopped processes and start polling the queue."""
+        await asyncio.to_thread(_requeue_stale_jobs)
+
+        self._tasks = [
+            asyncio.create_task(self._work(number)) for number in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._beat()))
+        logger.info(f"Iniciados {self.workers} workers de scraping ({self.worker_id}).")
+
+    async def stop(self):
+        """Stop the workers, their jobs are requeued once the heartbeat goes stale."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _beat(self):
+        """Keep the jobs of this process alive and requeue the ones of dead processes."""
+        while True:
+            await asyncio.sleep(settings.SCRAPER_JOB_HEARTBEAT_INTERVAL)
+            await asyncio.to_thread(beat_jobs, self.worker_id)
+            try:
+                await asyncio.to_thread(_requeue_stale_jobs)
+            except Exception as e:
+                logger.error(f"Error al reencolar los trabajos interrumpidos: {e}")
+
+    async def _work(self, number: int):
+        while True:
+            try:
+                claimed = await asyncio.to_thread(_claim_job, self.worker_id)
+            except Exception as e:
+                logger.error(f"Worker {number}: error al leer la cola de trabajos: {e}")
+                claimed = None
+
+            if claimed is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            await run_job(*claimed)
+
+
+_worker_pool = None
+
+
+def get_worker_pool() -> ScrapeWorkerPool:
+    """Return the scrape worker pool of this process."""
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = ScrapeWorkerPool(
+            settings.SCRAPER_WORKERS,
+            settings.SCRAPER_JOB_POLL_INTERVAL,
+        )
+    return _worker_pool
@@ -1,9 +1,11 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
 from ...core.logger_config import logger
+from ...core.metrics import DETAIL_FETCH_SECONDS, observe_seconds
+from ...core.pacing import get_pacer, run_blocking
+from .parsers import parse_candidate_details
+from .readiness import wait_until_ready
 
 # Función para extraer datos basados en el ícono
 async def extract_data_by_icon(driver, icon_class, is_link=False):
@@ -18,7 +20,7 @@ async def extract_data_by_icon(driver, icon_class, is_link=False):
     except:
         return None 
 
-async def extract_candidate_details(driver, candidate_details_link, candidate_id):
+def _read_candidate_details(driver, candidate_details_link, candidate_id):
     """
     Extrae detalles del candidato desde un enlace usando Selenium y muestra el progreso.
 
@@ -32,51 +34,10 @@ async def extract_candidate_details(driver, candidate_details_link, candidate_id
         driver.execute_script("window.open(arguments[0]);", candidate_details_link)
         driver.switch_to.window(driver.window_handles[-1])
 
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "ul.mtB.table.small"))
-        )
-
-        candidate_details = {}
-
-        # Mapeo de íconos a campos
-        icon_map = {
-            "i_email": "email",
-            "i_card": "id_number",
-            "i_mobile": "mobile_phone",
-            "i_whatsapp": "whatsapp",
-            "i_flag": "location",
-            "i_partner": "marital_status",
-            "i_yes": "employment_status",
-            "i_no": "driving_license", 
-            "i_money": "net_monthly_salary",
-        }
-
-        for icon_class, field in icon_map.items():
-            try:
-                # Buscar el ícono correspondiente
-                icon_element = driver.find_element(By.CSS_SELECTOR, f"span.icon.{icon_class}")
-                parent = icon_element.find_element(By.XPATH, "./ancestor::li")
-
-                if field == "whatsapp":
-                    link = parent.find_element(By.TAG_NAME, "a")
-                    candidate_details[field] = link.get_attribute("href") if link else None
-                else:
-                    candidate_details[field] = parent.find_element(By.CSS_SELECTOR, "span.w100").text.strip()
-
-            except NoSuchElementException:
-                candidate_details[field] = f"{field.replace('_', ' ').capitalize()} no encontrado"
-            except TimeoutException:
-                candidate_details[field] = f"{field.replace('_', ' ').capitalize()} no disponible (timeout)"
-            except Exception as e:
-                candidate_details[field] = f"Error al extraer {field}: {str(e)}"
+        wait_until_ready(driver, "candidate_details")
 
-        try:
-            cv_element = driver.find_element(By.CSS_SELECTOR, "ul.mtB.table.small a.js_download_file")
-            candidate_details["cv_link"] = cv_element.get_attribute("href")
-        except NoSuchElementException:
-            candidate_details["cv_link"] = "CV no encontrado"
-        except Exception as e:
-            candidate_details["cv_link"] = f"Error al extraer CV: {str(e)}"
+        # Un solo page_source para todos los campos en lugar de un find_element por ícono
+        candidate_details = parse_candidate_details(driver.page_source, driver.current_url)
 
         driver.close()
         driver.switch_to.window(driver.window_handles[0])
@@ -91,3 +52,15 @@ async def extract_candidate_details(driver, candidate_details_link, candidate_id
             driver.close()
             driver.switch_to.window(driver.window_handles[0])
         return {}
+
+
+async def extract_candidate_details(driver, candidate_details_link, candidate_id):
+    """
+    Extrae detalles del candidato sin bloquear el event loop.
+
+    La página se abre cuando el pacer lo permite y las llamadas a Selenium
+    se ejecutan en el executor.
+    """
+    await get_pacer().wait(candidate_details_link)
+    with observe_seconds(DETAIL_FETCH_SECONDS, fetcher="browser"):
+        return await run_blocking(_read_candidate_details, driver, candidate_details_link, candidate_id)
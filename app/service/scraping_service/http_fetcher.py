@@ -0,0 +1,143 @@
+import asyncio
+import time
+
+import httpx
+
+from ...core.config import settings
+from ...core.logger_config import logger
+from ...core.metrics import DETAIL_FETCH_SECONDS, PAGE_LOAD_SECONDS, observe_seconds
+from ...core.pacing import get_pacer
+from ...core.selenium import USER_AGENT
+from .parsers import parse_candidate_details, is_offer_expired
+
+
+def build_cookie_jar(selenium_cookies: list) -> httpx.Cookies:
+    """
+    Build an httpx cookie jar from the cookies of a Selenium session.
+
+    Args:
+        selenium_cookies (list): Cookies as returned by `driver.get_cookies()`,
+            the same list cached by `ensure_session`.
+
+    Returns:
+        httpx.Cookies
+    """
+    jar = httpx.Cookies()
+    for cookie in selenium_cookies:
+        jar.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain", ""),
+            path=cookie.get("path", "/"),
+        )
+    return jar
+
+
+class SessionFetcher:
+    """ Fetch computrabajo pages over HTTP with an authenticated session.
+
+    Reuses the cookies of a logged in browser so pages are loaded through
+    a pooled async client instead of a browser tab.
+
+    Args:
+        selenium_cookies (list): Cookies of the logged in Selenium session.
+        concurrency (int): Maximum number of requests in flight.
+    """
+
+    def __init__(self, selenium_cookies: list, concurrency: int = None):
+        self.concurrency = concurrency or settings.SCRAPER_HTTP_CONCURRENCY
+        self._cookies = build_cookie_jar(selenium_cookies)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._client = None
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(
+            cookies=self._cookies,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+            timeout=settings.SCRAPER_HTTP_TIMEOUT,
+            follow_redirects=True,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+        self._client = None
+
+    async def fetch_html(self, url: str, page: str):
+        """
+        Fetch a page with the session cookies.
+
+        Only the request itself is timed, not the wait for a free slot or
+        for the pacer.
+
+        Args:
+            url (str): Page to fetch.
+            page (str): Page type the load time is recorded under, the same
+                labels the browser uses (candidates, candidate_details, offers...).
+
+        Returns:
+            httpx.Response | None: The response, or None if the request failed
+            or the session was sent back to the login page.
+        """
+        async with self._semaphore:
+            await get_pacer().wait(url)
+            try:
+                with observe_seconds(PAGE_LOAD_SECONDS, page=page):
+                    response = await self._client.get(url)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                logger.error(f"Error al descargar {url}: {e}")
+                return None
+
+        if "Login" in response.url.path:
+            logger.error(f"La sesión fue rechazada al descargar {url}")
+            return None
+        return response
+
+    async def fetch(self, candidate_details_link: str, candidate_id: str) -> dict:
+        """
+        Fetch and parse the detail page of one candidate.
+
+        Returns:
+            dict: The extracted details, or an empty dict if the page could
+            not be loaded, as `extract_candidate_details` does.
+        """
+        if not candidate_details_link or not candidate_details_link.startswith("http"):
+            logger.error(f"Enlace de detalle inválido para el candidato {candidate_id}")
+            return {}
+
+        response = await self.fetch_html(candidate_details_link, page="candidate_details")
+        if response is None:
+            return {}
+
+        # La descarga (response.elapsed) más la lectura, sin las esperas previas
+        started = time.perf_counter()
+        candidate_details = parse_candidate_details(response.text, str(response.url))
+        DETAIL_FETCH_SECONDS.labels(fetcher="http").observe(
+            response.elapsed.total_seconds() + time.perf_counter() - started
+        )
+        candidate_details['uuid_candidate'] = candidate_id
+        return candidate_details
+
+    async def fetch_all(self, candidates: list) -> list:
+        """Fetch the detail pages of several candidates with bounded concurrency."""
+        return await asyncio.gather(*[
+            self.fetch(candidate['details_link'], candidate['uuid_candidate'])
+            for candidate in candidates
+        ])
+
+    async def is_offer_expired(self, url: str):
+        """
+        Check over HTTP whether an offer shows the expired offer header.
+
+        Returns:
+            bool | None: None when the page could not be loaded.
+        """
+        response = await self.fetch_html(url, page="offer")
+        if response is None:
+            return None
+        return is_offer_expired(response.text)
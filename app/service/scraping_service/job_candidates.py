@@ -1,5 +1,4 @@
-import time
-import re
+import asyncio
 
 from selenium.common.exceptions import WebDriverException, TimeoutException, NoSuchElementException
 
@@ -8,20 +7,48 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from ..candidate_service import _save_candidates_batch
 from ..candidate_service import save_candidate_details_batch
-
-from ...utils.utils import extract_offer_id
+from ..candidate_service import get_known_candidates
+from ..job_service import record_job_progress
+from ..offer_service import plan_offer_scrape, mark_offer_scraped
+from ..checkpoint_service import (
+    get_checkpoint,
+    save_details_checkpoint,
+    save_page_checkpoint,
+    complete_offer_checkpoint,
+)
+
+from ...core.config import settings
+from ...core.metrics import (
+    LISTING_PARSE_SECONDS,
+    PAGE_LOAD_SECONDS,
+    SCRAPE_TIMEOUTS,
+    SCRAPED_CANDIDATES,
+    SCRAPED_PAGES,
+    observe_seconds,
+    scrape_labels,
+)
+from ...core.pacing import get_pacer, run_blocking
+from ...utils.utils import build_page_url, extract_offer_id
 from .details_candidate import extract_candidate_details
+from .http_fetcher import SessionFetcher
+from .parsers import parse_candidate_listing, parse_pager, extract_candidate_id
+from .readiness import wait_until_ready
 from ...core.logger_config import logger
 
 
-async def extract_candidate_info(driver):
-    """ Get the information of the candidates from the page. """
-    candidates_info = []
-
+def _read_candidate_info(driver, from_source):
     # Esperar a que los artículos de candidatos carguen
-    WebDriverWait(driver, 10).until(
-        EC.presence_of_all_elements_located((By.CSS_SELECTOR, "article.rowuser"))
-    )
+    wait_until_ready(driver, "candidates")
+
+    with observe_seconds(LISTING_PARSE_SECONDS, listing="candidates"):
+        if from_source:
+            return parse_candidate_listing(driver.page_source, driver.current_url)
+        return _read_candidate_articles(driver)
+
+
+def _read_candidate_articles(driver):
+    """Read the candidates of the current page field by field through WebDriver."""
+    candidates_info = []
 
     # Extraer la información de los candidatos en la página actual
     articles = driver.find_elements(By.CSS_SELECTOR, "article.rowuser")
@@ -59,9 +86,7 @@ async def extract_candidate_info(driver):
 
         candidate_id = None
         if profile_link != "Enlace no encontrado":
-            match = re.search(r'ims=([A-F0-9]+)', profile_link)
-            if match:
-                candidate_id = match.group(1)
+            candidate_id = extract_candidate_id(profile_link)
 
         candidate = {
             "name": name,
@@ -77,15 +102,47 @@ async def extract_candidate_info(driver):
     return candidates_info
 
 
-async def extract_candidatos(driver, offer_id, url, wait, batch_size=50):
-    """ function to extract candidates from the website """
+async def extract_candidate_info(driver, from_source=None):
+    """ Get the information of the candidates from the page.
+
+    Args:
+        driver: Instance of Selenium WebDriver.
+        from_source: Parse `driver.page_source` in-process instead of reading
+            each field through WebDriver. Defaults to SCRAPER_PARSE_FROM_SOURCE.
+    """
+    if from_source is None:
+        from_source = settings.SCRAPER_PARSE_FROM_SOURCE
+    return await run_blocking(_read_candidate_info, driver, from_source)
+
+
+def _candidate_row(candidate, offer_id):
+    """Map a candidate read from the listing to the fields saved by the scraper."""
+    return {
+        'name': candidate.get('name', 'N/A'),
+        'application_date': candidate.get('applied_date', 'N/A'),
+        'age': candidate.get('age', 'N/A'),
+        'education_level': candidate.get('studies', 'N/A'),
+        'suitability': candidate.get('adequacy', 'N/A'),
+        'details_link': candidate.get('profile_link', 'N/A'),
+        'uuid_candidate': candidate.get('candidate_id', 'N/A'),
+        'uuid_offer': offer_id
+    }
+
+
+async def extract_candidatos(driver, offer_id, url, wait, batch_size=50, save=True):
+    """ function to extract candidates from the website
+
+    Args:
+        save: Save the candidates here. The pipeline of `process_pagination`
+            leaves them to its writer stage.
+    """
     info_candidate = {}  
     all_candidates = []  
     batch = [] 
     
     
     logger.info('Procesando la extracción...')
-    logger.info(driver.current_url)
+    logger.info(url)
     
     all_candidates = []
 
@@ -99,113 +156,562 @@ async def extract_candidatos(driver, offer_id, url, wait, batch_size=50):
     
     for candidate in candidates_info:
         try:
-            candidate_data = {
-                'name': candidate.get('name', 'N/A'),
-                'application_date': candidate.get('applied_date', 'N/A'),
-                'age': candidate.get('age', 'N/A'),
-                'education_level': candidate.get('studies', 'N/A'),
-                'suitability': candidate.get('adequacy', 'N/A'),
-                'details_link': candidate.get('profile_link', 'N/A'),
-                'uuid_candidate': candidate.get('candidate_id', 'N/A'),
-                'uuid_offer': offer_id
-            }
+            candidate_data = _candidate_row(candidate, offer_id)
             
             batch.append(candidate_data)
             all_candidates.append(candidate_data)
                     
-            if len(batch) >= batch_size:
+            if save and len(batch) >= batch_size:
                 await _save_candidates_batch(batch)
                 batch.clear()
 
         except Exception as e:
             logger.info(f"Error procesando el candidato: {e}")
 
-    if batch:
+    if save and batch:
         await _save_candidates_batch(batch)
 
     logger.info('Fin de la extracción')
     return all_candidates
 
-async def process_pagination(driver, wait, url):
+
+def _open_offer(driver, url):
+    """Open an offer, return the URL it ended on and whether it was ready in time."""
+    driver.get(url)
+    try:
+        wait_until_ready(driver, "offer")
+        return driver.current_url, True
+    except TimeoutException:
+        # Redirección al login o a Account/Used, se revisa con la URL actual
+        return driver.current_url, False
+
+
+def _read_pager(driver):
+    """Read the pager of the current listing page, see `parse_pager`."""
+    pager = wait_until_ready(driver, "pager")
+    return parse_pager(pager.get_attribute("outerHTML"), driver.current_url)
+
+
+def _open_listing_page(driver, url):
+    """Open a listing page by its URL and read its pager."""
+    with observe_seconds(PAGE_LOAD_SECONDS, page="candidates"):
+        driver.get(url)
+        return _read_pager(driver)
+
+
+def _go_to_next_page(driver, wait):
+    """
+    Click the 'Siguiente' button and read the pager of the new page.
+
+    Only used when the pager links do not carry the page number, since
+    the pages can then only be visited in order.
+
+    Returns:
+        dict | None: The pager of the new page, None if there is no next page.
+    """
+    pager = wait_until_ready(driver, "pager")
+    try:
+        # Busca el botón "Siguiente" y verifica si está habilitado
+        next_button = pager.find_element(By.CLASS_NAME, "b_next")
+    except NoSuchElementException:
+        logger.info("No se encontró el botón 'Siguiente'.")
+        return None
+
+    with observe_seconds(PAGE_LOAD_SECONDS, page="candidates"):
+        next_button.click()
+
+        # Espera a que el DOM se actualice
+        wait.until(EC.staleness_of(pager))
+        return _read_pager(driver)
+
+
+def _parse_listing_page(page_source, url, offer_id):
+    """Parse the candidates and the pager of a listing page fetched over HTTP."""
+    with observe_seconds(LISTING_PARSE_SECONDS, listing="candidates"):
+        candidates = [
+            _candidate_row(candidate, offer_id)
+            for candidate in parse_candidate_listing(page_source, url)
+        ]
+        return candidates, parse_pager(page_source, url)
+
+
+# Marca de fin de cola entre las etapas del pipeline
+_DONE = object()
+# La página pedida ya no existe, la oferta tiene menos páginas que antes
+_NO_PAGE = object()
+
+
+class _OfferPipeline:
+    """ Pipeline that scrapes the candidates of one offer.
+
+    Three stages run concurrently and are linked by bounded queues, so a
+    slow stage holds back the ones before it instead of piling up pages:
+
+    - the listing producer walks the pages of the offer and queues the
+      candidates of each page;
+    - the detail fetchers load the detail pages of those candidates;
+    - the writer saves candidates and details in batches and checkpoints
+      every page once all of its details were saved.
+
+    The browser is shared by the producer and, in browser mode, by the
+    detail fetcher, so every WebDriver call is made under `driver_lock`.
+
+    Args:
+        driver: Instance of Selenium WebDriver already on the first page.
+        wait: WebDriverWait set up with a wait time.
+        url: URL of the offer.
+        offer_id: Identifier of the offer.
+        job_id: Scrape job whose checkpoints and progress are updated.
+        account: Account the counters are labelled with.
+        checkpoint: Where a previous run of the job stopped on the offer.
+        known_candidates: uuid_candidate -> True if its details are fresh.
+        incremental: Stop once a page holds only known candidates.
+        max_pages: Last page to process, None for every page.
+    """
+
+    def __init__(self, driver, wait, url, offer_id, job_id, account, checkpoint,
+                 known_candidates, incremental, max_pages):
+        self.driver = driver
+        self.wait = wait
+        self.url = url
+        self.offer_id = offer_id
+        self.job_id = job_id
+        self.checkpoint = checkpoint
+        self.known_candidates = known_candidates
+        self.incremental = incremental
+        self.max_pages = max_pages
+
+        self.driver_lock = asyncio.Lock()
+        self.detail_queue = asyncio.Queue(maxsize=settings.SCRAPER_PIPELINE_QUEUE_SIZE)
+        self.write_queue = asyncio.Queue(maxsize=settings.SCRAPER_PIPELINE_QUEUE_SIZE)
+        self.failed = asyncio.Event()
+        self.fetcher = None
+        self.labels = scrape_labels(account)
+
+        # Enlaces y parámetro de página del paginador, para abrir cualquier página
+        self.page_param = None
+        self.page_urls = {}
+        self.last_page = 0
+        self.page_tasks = {}
+
+    async def _count_timeout(self):
+        """Count a timed out wait in the metrics and in the totals of the job."""
+        SCRAPE_TIMEOUTS.labels(**self.labels).inc()
+        await run_blocking(record_job_progress, self.job_id, timeouts=1)
+
+    async def run(self) -> bool:
+        """Run the three stages, True if every page of the offer was saved."""
+        if settings.SCRAPER_DETAIL_FETCHER == "http":
+            cookies = await run_blocking(self.driver.get_cookies)
+            async with SessionFetcher(cookies) as self.fetcher:
+                return await self._run_stages(settings.SCRAPER_DETAIL_WORKERS)
+        # Con el navegador solo hay una sesión para abrir los detalles
+        return await self._run_stages(1)
+
+    async def _run_stages(self, fetchers: int) -> bool:
+        fetchers = max(1, fetchers)
+        writer = asyncio.create_task(self._write())
+        details = [asyncio.create_task(self._fetch_details()) for _ in range(fetchers)]
+        try:
+            reached_end = await self._list_pages()
+        finally:
+            for _ in details:
+                await self.detail_queue.put(_DONE)
+            await asyncio.gather(*details)
+            await self.write_queue.put(_DONE)
+            await writer
+        return reached_end and not self.failed.is_set()
+
+    async def _browser(self, func, *args):
+        async with self.driver_lock:
+            return await run_blocking(func, *args)
+
+    async def _list_pages(self) -> bool:
+        """
+        Producer stage: walk the listing pages and queue their candidates.
+
+        The pages are opened by their URL, built from the links or the page
+        parameter of the pager, so a restarted job goes straight to the page
+        after its checkpoint and a failed page is retried alone.
+
+        Returns:
+            bool: True if the last page to process was reached.
+        """
+        chunk_size = settings.SCRAPER_DETAIL_CHUNK_SIZE
+        try:
+            pager = await self._browser(_read_pager, self.driver)
+            if pager["current"] is None:
+                logger.info("No se detectó la página actual.")
+                return False
+            self._update_pager(pager)
+            page = pager["current"]
+
+            resume_page = self.checkpoint["last_page"] + 1
+            listing = None
+            if page < resume_page and self._addressable(resume_page):
+                logger.info(f"Reanudando directamente en la página {resume_page}.")
+                page = resume_page
+            else:
+                # Sin enlaces a las páginas solo se puede avanzar con "Siguiente"
+                while page < resume_page:
+                    pager = await self._browser(_go_to_next_page, self.driver, self.wait)
+                    if pager is None:
+                        return True
+                    self._update_pager(pager)
+                    page = pager["current"]
+
+                async with self.driver_lock:
+                    candidates = await extract_candidatos(
+                        self.driver, self.offer_id, self.url, self.wait, save=False
+                    ) or []
+                listing = (candidates, pager)
+
+            while not self.failed.is_set():
+                if listing is None:
+                    listing = await self._load_page(page)
+                    if listing is None:
+                        return False
+                    if listing is _NO_PAGE:
+                        return True
+                candidates, pager = listing
+                listing = None
+                self._update_pager(pager)
+                logger.info(f"Estás en la página: {page}")
+                logger.info(f"numero de candidatos: {len(candidates)}")
+
+                pending_candidates = [
+                    candidate for candidate in candidates
+                    if not self.known_candidates.get(candidate['uuid_candidate'])
+                    and candidate['uuid_candidate'] not in self.checkpoint["saved_candidates"]
+                ]
+                if self.incremental:
+                    logger.info(f"Candidatos nuevos o desactualizados: {len(pending_candidates)}")
+
+                chunks = [
+                    pending_candidates[start:start + chunk_size]
+                    for start in range(0, len(pending_candidates), chunk_size)
+                ]
+                # El writer recibe la página antes que cualquiera de sus detalles
+                await self.write_queue.put(("page", page, candidates, len(chunks)))
+                for chunk in chunks:
+                    await self.detail_queue.put((page, chunk))
+
+                # El listado está ordenado por fecha de aplicación: una página
+                # sin candidatos nuevos significa que las siguientes tampoco los tienen
+                if self.incremental and all(
+                    candidate['uuid_candidate'] in self.known_candidates for candidate in candidates
+                ):
+                    logger.info("La página solo tiene candidatos conocidos, fin de la paginación.")
+                    return True
+
+                if self.max_pages and page >= self.max_pages:
+                    logger.info(f"Revisadas las {self.max_pages} páginas con nuevos postulantes.")
+                    return True
+
+                if not pager["has_next"]:
+                    logger.info("No se encontró el botón 'Siguiente'.")
+                    return True
+
+                page += 1
+                logger.info(f"Pasando a la página: {page}")
+
+        except Exception as e:
+            if isinstance(e, TimeoutException):
+                await self._count_timeout()
+            logger.error(f"Error en el ciclo principal: {e}")
+        finally:
+            tasks = list(self.page_tasks.values())
+            self.page_tasks.clear()
+            for task in tasks:
+                task.cancel()
+            # Las descargas canceladas terminan antes de cerrar el cliente HTTP
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return False
+
+    def _update_pager(self, pager):
+        """Keep the page links seen so far, a pager may only link the pages near its own."""
+        self.page_param = self.page_param or pager["page_param"]
+        self.page_urls.update(pager["page_urls"])
+        self.last_page = max(self.last_page, pager["last"] or 0)
+
+    def _addressable(self, page) -> bool:
+        return self.page_param is not None or page in self.page_urls
+
+    def _page_url(self, page) -> str:
+        return self.page_urls.get(page) or build_page_url(self.url, self.page_param, page)
+
+    async def _load_page(self, page):
+        """
+        Load one listing page and read its candidates.
+
+        Pages are fetched over HTTP when the details are, with the next
+        SCRAPER_LISTING_PREFETCH pages already requested, and opened in the
+        browser otherwise. A page that fails is retried alone, up to
+        SCRAPER_PAGE_ATTEMPTS times, unless it can only be reached by
+        clicking 'Siguiente'.
+
+        Returns:
+            tuple | None: The candidates and the pager of the page, `_NO_PAGE`
+            if the offer does not have it anymore, None if it failed.
+        """
+        addressable = self._addressable(page)
+        attempts = settings.SCRAPER_PAGE_ATTEMPTS if addressable else 1
+        for attempt in range(1, attempts + 1):
+            try:
+                if self.fetcher is not None and addressable:
+                    if attempt == 1:
+                        listing = await self._prefetched_page(page)
+                    else:
+                        listing = await self._fetch_page(page)
+                else:
+                    listing = await self._browse_page(page, addressable)
+
+                if listing is not None:
+                    pager = listing[1]
+                    if pager["current"] == page:
+                        return listing
+                    if pager["current"] is not None and pager["current"] < page and not pager["has_next"]:
+                        logger.info(f"La oferta ya no tiene la página {page}.")
+                        return _NO_PAGE
+            except Exception as e:
+                if isinstance(e, TimeoutException):
+                    await self._count_timeout()
+                logger.error(f"Error al cargar la página {page}: {e}")
+
+            if attempt < attempts:
+                logger.info(f"No se cargó la página {page} (intento {attempt}), se reintenta.")
+        logger.error(f"No fue posible cargar la página {page}.")
+        return None
+
+    async def _browse_page(self, page, addressable):
+        """Open a listing page in the browser, by its URL or with 'Siguiente'."""
+        await get_pacer().wait_page(self.url)
+        async with self.driver_lock:
+            if addressable:
+                pager = await run_blocking(_open_listing_page, self.driver, self._page_url(page))
+            else:
+                pager = await run_blocking(_go_to_next_page, self.driver, self.wait)
+                if pager is None:
+                    return None
+            if pager["current"] != page:
+                return [], pager
+            candidates = await extract_candidatos(
+                self.driver, self.offer_id, self.url, self.wait, save=False
+            ) or []
+        return candidates, pager
+
+    async def _fetch_page(self, page):
+        """Fetch a listing page over HTTP with the session of the browser."""
+        response = await self.fetcher.fetch_html(self._page_url(page), page="candidates")
+        if response is None:
+            return None
+        return await run_blocking(_parse_listing_page, response.text, str(response.url), self.offer_id)
+
+    async def _prefetched_page(self, page):
+        """Fetch a listing page, requesting the next pages of the prefetch window with it."""
+        last_page = min(self.last_page, self.max_pages) if self.max_pages else self.last_page
+        for ahead in range(page, min(page + settings.SCRAPER_LISTING_PREFETCH, last_page) + 1):
+            if ahead not in self.page_tasks and self._addressable(ahead):
+                self.page_tasks[ahead] = asyncio.create_task(self._fetch_page(ahead))
+        task = self.page_tasks.pop(page, None)
+        if task is None:
+            return await self._fetch_page(page)
+        return await task
+
+    async def _fetch_details(self):
+        """Consumer stage: fetch the details of the queued chunks for the writer."""
+        while True:
+            item = await self.detail_queue.get()
+            if item is _DONE:
+                return
+            page, chunk = item
+            try:
+                if self.fetcher is not None:
+                    details_list = await self.fetcher.fetch_all(chunk)
+                else:
+                    details_list = []
+                    for candidate in chunk:
+                        async with self.driver_lock:
+                            details_list.append(await extract_candidate_details(
+                                self.driver, candidate['details_link'], candidate['uuid_candidate']
+                            ))
+            except Exception as e:
+                if isinstance(e, TimeoutException):
+                    await self._count_timeout()
+                logger.error(f"Error al extraer los detalles de la página {page}: {e}")
+                self.failed.set()
+                details_list = []
+            await self.write_queue.put(("details", page, details_list, None))
+
+    async def _write(self):
+        """
+        Writer stage: save the candidates and their details in batches.
+
+        A page is checkpointed, and counted in the job progress, once all of
+        its details were saved and every page before it was checkpointed.
+        """
+        batch_size = settings.SCRAPER_WRITE_BATCH_SIZE
+        candidates_batch, details_batch = [], []
+        # página -> [chunks de detalles pendientes, candidatos de la página]
+        pages = {}
+        next_page = None
+
+        async def flush():
+            nonlocal candidates_batch, details_batch, next_page
+            if candidates_batch:
+                if await _save_candidates_batch(candidates_batch) is None:
+                    self.failed.set()
+                candidates_batch = []
+            if details_batch:
+                saved_uuids = [details['uuid_candidate'] for details in details_batch if details]
+                if len(saved_uuids) < len(details_batch):
+                    # Un detalle vacío es una página que no cargó, la página se vuelve a procesar
+                    logger.error("No se extrajeron los detalles de algunos candidatos.")
+                    self.failed.set()
+                if not await save_candidate_details_batch(details_batch):
+                    self.failed.set()
+                    saved_uuids = []
+                if saved_uuids:
+                    await run_blocking(save_details_checkpoint, self.job_id, self.url, saved_uuids)
+                details_batch = []
+
+            # Las páginas se confirman en orden aunque terminen desordenadas
+            while not self.failed.is_set() and next_page in pages and pages[next_page][0] == 0:
+                _, candidates = pages.pop(next_page)
+                await run_blocking(
+                    save_page_checkpoint,
+                    self.job_id,
+                    self.url,
+                    next_page,
+                    [candidate['uuid_candidate'] for candidate in candidates],
+                )
+                await run_blocking(
+                    record_job_progress, self.job_id, pages=1, candidates=len(candidates)
+                )
+                SCRAPED_PAGES.labels(**self.labels).inc()
+                SCRAPED_CANDIDATES.labels(**self.labels).inc(len(candidates))
+                next_page += 1
+
+        while True:
+            item = await self.write_queue.get()
+            if item is _DONE:
+                break
+            kind, page, items, chunks = item
+            try:
+                if kind == "page":
+                    if next_page is None:
+                        next_page = page
+                    pages[page] = [chunks, items]
+                    candidates_batch.extend(items)
+                else:
+                    pages[page][0] -= 1
+                    details_batch.extend(items)
+
+                page_finished = pages[page][0] == 0
+                if (
+                    page_finished
+                    or len(candidates_batch) + len(details_batch) >= batch_size
+                    or self.write_queue.empty()
+                ):
+                    await flush()
+            except Exception as e:
+                logger.error(f"Error al guardar los candidatos de la página {page}: {e}")
+                self.failed.set()
+
+        try:
+            await flush()
+        except Exception as e:
+            logger.error(f"Error al guardar los últimos candidatos de la oferta: {e}")
+            self.failed.set()
+
+
+async def process_pagination(driver, wait, url, job_id=None, incremental=False, snapshot=None, account=None):
     """
     function to process pagination on the website and extract candidates.
 
+    The pages are listed, their details fetched and everything saved by the
+    concurrent stages of `_OfferPipeline`. When it runs for a job, the last
+    finished page and the candidates whose details were saved are
+    checkpointed, so a restarted job resumes on the page where it stopped.
+
     Args:
         driver: Instance of Selenium WebDriver.
         wait: WebDriverWait configurado con un tiempo de espera.
         wait: WebDriverWaitset up with a wait time.
         url: URL to start the navigation.
+        job_id: Scrape job whose progress is updated after every page.
+        incremental: Only fetch the details of new candidates or of candidates
+            whose details are older than SCRAPER_DETAIL_TTL_HOURS, and stop
+            once a page holds only known candidates. Offers whose applicants
+            count and last update did not change since the last complete
+            scrape are skipped, and new applicants only fetch the first pages.
+        snapshot: Applicants count and last update of the offer read from
+            the offers listing by this job, see `read_offer_snapshots`. It is
+            saved as the scraped snapshot once the offer is complete.
+        account: Account that runs the job, the label of the scraping counters.
+
+    Returns:
+        bool: True if every page of the offer was processed.
     """
+    pacer = get_pacer()
+    offer_id = extract_offer_id(url)
+    completed = False
     try:
-        driver.get(url)
-        logger.info(f"Página inicial: {driver.current_url}")
+        checkpoint = await run_blocking(get_checkpoint, job_id, url)
+        if checkpoint["completed"]:
+            logger.info(f"La oferta {url} ya fue procesada por este trabajo.")
+            return True
+        if checkpoint["last_page"]:
+            logger.info(f"Reanudando la oferta {url} después de la página {checkpoint['last_page']}.")
+
+        max_pages = None
+        if incremental and offer_id:
+            skip, max_pages = await run_blocking(
+                plan_offer_scrape, offer_id, settings.SCRAPER_LISTING_PAGE_SIZE, snapshot
+            )
+            if skip:
+                logger.info(f"La oferta {offer_id} no cambió desde el último scraping, se omite.")
+                await run_blocking(complete_offer_checkpoint, job_id, url)
+                return True
+            if max_pages:
+                logger.info(f"La oferta {offer_id} tiene nuevos postulantes, se revisarán {max_pages} páginas.")
+
+        await pacer.wait_page(url)
+        with observe_seconds(PAGE_LOAD_SECONDS, page="offer"):
+            current_url, ready = await run_blocking(_open_offer, driver, url)
+        logger.info(f"Página inicial: {current_url}")
+        if not ready:
+            logger.warning(f"La oferta {url} no cargó en {settings.SCRAPER_READY_TIMEOUT} segundos.")
+            SCRAPE_TIMEOUTS.labels(**scrape_labels(account)).inc()
+            await run_blocking(record_job_progress, job_id, timeouts=1)
         
-        if driver.current_url == "https://empresa.co.computrabajo.com/Account/Used" or driver.current_url == "https://empresa.co.computrabajo.com/Login?ReturnUrl=%2fCompany":
+        if current_url in (
+            f"{settings.COMPUTRABAJO_BASE_URL}/Account/Used",
+            f"{settings.COMPUTRABAJO_BASE_URL}/Login?ReturnUrl=%2fCompany",
+        ):
             logger.info("No es posible acceder a la página...")
-            return
-
-        current_url = driver.current_url
-        offer_id = extract_offer_id(current_url)
-        current_page = 1
+            return False
 
-        while True:
-            try:
-                pager = wait.until(EC.presence_of_element_located((By.ID, "pager_Pager_PageSelected")))
-                pages = pager.find_elements(By.TAG_NAME, "a")
-
-                # Detecta la página actual
-                current_page_element = None
-                for page in pages:
-                    if "sel" in page.get_attribute("class"):
-                        current_page_element = page
-                        current_page = int(page.text.strip())
-                        logger.info(f"Estás en la página: {current_page}")
-                        break
-
-                if not current_page_element:
-                    logger.info("No se detectó la página actual.")
-                    break
-
-                candidates = await extract_candidatos(driver, offer_id, url,wait)
-                
-                logger.info(f"numero de candidatos: {len(candidates)}")
-                
-                logger.info(f"procesados la extracción de detalles  de: {len(candidates)} candidatos.")
-                
-                details_list =[]
-                for candidate in candidates:
-                    details = await extract_candidate_details(driver, candidate['details_link'], candidate['uuid_candidate'])
-                    details_list.append(details)
-                                        
-                    
-                await save_candidate_details_batch(details_list) ## saque esto del for
-                details_list.clear()
-                
-                time.sleep(5)
-                
-                try:
-                    # Busca el botón "Siguiente" y verifica si está habilitado
-                    next_button = pager.find_element(By.CLASS_NAME, "b_next")
-
-                
-                except TimeoutException:
-                    print("No se encontró el botón 'Siguiente' después del tiempo de espera.")
-                    return None
-                except NoSuchElementException:
-                    print("No se encontró el botón 'Siguiente'.")
-                    return None
+        offer_id = extract_offer_id(current_url) or offer_id
 
-                # Haz clic en "Siguiente" para avanzar
-                logger.info(f"Pasando a la página: {current_page + 1}")
-                next_button.click()
+        # uuid_candidate -> True si sus detalles siguen vigentes
+        known_candidates = {}
+        if incremental:
+            known_candidates = await run_blocking(
+                get_known_candidates, offer_id, settings.SCRAPER_DETAIL_TTL_HOURS
+            )
+            logger.info(f"Candidatos ya guardados para la oferta: {len(known_candidates)}")
 
-                # Espera a que el DOM se actualice
-                wait.until(EC.staleness_of(pager))
-
-            except Exception as e:
-                logger.error(f"Error en el ciclo principal: {e}")
-                break
+        pipeline = _OfferPipeline(
+            driver, wait, url, offer_id, job_id, account, checkpoint,
+            known_candidates, incremental, max_pages,
+        )
+        completed = await pipeline.run()
+        return completed
 
     finally:
+        if completed:
+            await run_blocking(complete_offer_checkpoint, job_id, url)
+            if offer_id:
+                await run_blocking(mark_offer_scraped, offer_id, snapshot)
         logger.info(f"Finalizando extracción de candidatos para la oferta: {url}")
-
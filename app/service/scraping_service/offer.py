@@ -1,6 +1,3 @@
-import asyncio
-import time
-import random
 import traceback
 
 from selenium.webdriver.common.by import By
@@ -19,11 +16,16 @@ from selenium.common.exceptions import (
     ElementNotInteractableException
 )
 
-from ..offer_service import create_offer
+from ..offer_service import save_offers_batch
+from ...core.config import settings
 from ...core.logger_config import logger
+from ...core.metrics import LISTING_PARSE_SECONDS, PAGE_LOAD_SECONDS, observe_seconds
+from ...core.pacing import get_pacer, run_blocking
+from .parsers import parse_offer_listing
+from .readiness import wait_until_ready
 
-async def process_offer(db, article, user_id):
-    """Procesa una sola oferta de trabajo de un artículo."""
+def _read_offer(article):
+    """Lee los campos de una oferta de trabajo de un artículo."""
     offer = {}
 
     try:
@@ -84,23 +86,29 @@ async def process_offer(db, article, user_id):
     except Exception:
         offer["status"] = "Activa"
 
-    # Guardar la oferta en la base de datos asincrónicamente
-    await create_offer(db, user_id, offer)
-
-    # Introducimos un pequeño delay aleatorio para simular comportamiento humano
-    await asyncio.sleep(random.uniform(1, 2))
-
     return offer
 
+
 def go_to_next_page(driver):
-    """Manejo de paginación de la oferta (ir a la siguiente página)."""
+    """Manejo de paginación de la oferta (ir a la siguiente página).
+
+    Returns:
+        bool: True once the next page replaced the current one.
+    """
     try:
+        current_article = driver.find_element(By.CSS_SELECTOR, "article.aClick")
         siguiente_boton = WebDriverWait(driver, 10).until(
         EC.element_to_be_clickable((By.XPATH, "//a[@class='b_next']/span[contains(text(),'Siguiente')]"))
     )
-        siguiente_boton.click()
+        with observe_seconds(PAGE_LOAD_SECONDS, page="offers"):
+            siguiente_boton.click()
+            WebDriverWait(driver, settings.SCRAPER_READY_TIMEOUT).until(
+                EC.staleness_of(current_article)
+            )
+        return True
     except Exception as e:
-        print(f"Error al hacer clic en 'Siguiente': {e}")
+        logger.error(f"Error al hacer clic en 'Siguiente': {e}")
+        return False
     
     # try:
     #     next_button = driver.find_element(By.CSS_SELECTOR, "a.b_next")
@@ -176,57 +184,67 @@ def go_to_next_page(driver):
 
 
 
-async def extract_all_offers(db, driver, url, user_id, batch_size=10):
-    """Extrae todas las ofertas laborales desde la página procesándolas en lotes."""
-    try:
+def _open_page(driver, url):
+    with observe_seconds(PAGE_LOAD_SECONDS, page="offers"):
         driver.get(url)
-        print(f"Página inicial: {driver.current_url}")
+    return driver.current_url
+
+
+def _read_offers_page(driver, from_source):
+    """Read every offer of the current listing page, parsed in one pass from its HTML."""
+    articles = wait_until_ready(driver, "offers")
+    with observe_seconds(LISTING_PARSE_SECONDS, listing="offers"):
+        if from_source:
+            return parse_offer_listing(driver.page_source, driver.current_url)
+        return [_read_offer(article) for article in articles]
+
+
+async def extract_all_offers(db, driver, url, user_id, batch_size=50):
+    """Extrae todas las ofertas laborales desde la página.
+
+    Each listing page is parsed in one pass and the offers are saved with
+    one upsert per batch of `batch_size`. The pause between requests is
+    taken once per page.
+    """
+    try:
+        pacer = get_pacer()
+        await pacer.wait_page(url)
+        current_url = await run_blocking(_open_page, driver, url)
+        logger.info(f"Página inicial: {current_url}")
         offers_data = []
-        all_articles = []  # Lista para almacenar todos los artículos de la página
+        pending_offers = []
 
         while True:
             try:
-                # Esperar que los artículos se carguen de manera más eficiente
-                WebDriverWait(driver, 60).until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, "article.aClick"))
+                offers = await run_blocking(
+                    _read_offers_page, driver, settings.SCRAPER_PARSE_FROM_SOURCE
                 )
             except TimeoutException:
-                logger.error(f"Timeout esperando artículos en la URL: {driver.current_url}")
+                logger.error(f"Timeout esperando artículos en la URL: {url}")
                 break  # Salir del loop si ocurre un timeout
 
-            # Seleccionar todos los artículos de la página actual
-            articles = driver.find_elements(By.CSS_SELECTOR, "article.aClick")
-            if not articles:
+            if not offers:
                 logger.warning("No se encontraron artículos en esta página.")
                 break  # Si no se encontraron artículos, salir del loop
 
-            all_articles.extend(articles)  # Añadimos los artículos a la lista global
+            offers_data.extend(offers)
+            pending_offers.extend(offers)
 
-            while len(all_articles) >= batch_size:
-                batch = all_articles[:batch_size]  # Creamos el lote
-                all_articles = all_articles[batch_size:]  # Eliminamos el lote procesado
+            while len(pending_offers) >= batch_size:
+                await save_offers_batch(pending_offers[:batch_size], user_id, db)
+                pending_offers = pending_offers[batch_size:]
 
-                tasks = [asyncio.create_task(process_offer(db, article, user_id)) for article in batch]
-                batch_results = await asyncio.gather(*tasks)
-                # Filtrar valores None (en caso de error durante el procesamiento)
-                batch_results = [result for result in batch_results if result is not None]
-                offers_data.extend(batch_results)  # Añadimos los resultados del lote a la lista final
+            # Pausa por página según la política de pacing
+            await pacer.wait_page(url)
 
             # Intentar avanzar a la siguiente página
-            if not go_to_next_page(driver):
-                print("No se encontró el botón 'Siguiente', terminando la extracción.")
+            if not await run_blocking(go_to_next_page, driver):
+                logger.info("No se encontró el botón 'Siguiente', terminando la extracción.")
                 break
 
-            # Añadir una pequeña pausa para evitar demasiadas solicitudes rápidas al servidor
-            time.sleep(random.uniform(3, 5))
-
-        # Procesar los artículos restantes si hay alguno pendiente
-        if all_articles:
-            tasks = [asyncio.create_task(process_offer(db, article, user_id)) for article in all_articles]
-            batch_results = await asyncio.gather(*tasks)
-            # Filtrar valores None (en caso de error durante el procesamiento)
-            batch_results = [result for result in batch_results if result is not None]
-            offers_data.extend(batch_results)
+        # Guardar las ofertas restantes si hay alguna pendiente
+        if pending_offers:
+            await save_offers_batch(pending_offers, user_id, db)
 
         return offers_data
 
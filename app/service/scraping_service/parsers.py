@@ -0,0 +1,314 @@
+import re
+from urllib.parse import parse_qs, urljoin, urlparse
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from lxml.etree import XPath
+
+
+# Selectores compilados una sola vez para el listado de candidatos
+CANDIDATE_ARTICLE = CSSSelector("article.rowuser")
+CANDIDATE_NAME = CSSSelector("a.js-o-link.nom .w75_ms")
+CANDIDATE_APPLIED_DATE = CSSSelector("li.aplicado")
+CANDIDATE_AGE = CSSSelector("li.edad")
+CANDIDATE_STUDIES = CSSSelector("li.estudios")
+CANDIDATE_ADEQUACY = CSSSelector("li.adecuacion p.fs_24")
+CANDIDATE_PROFILE_LINK = CSSSelector("a.js-o-link.nom")
+
+CANDIDATE_ID_PATTERN = re.compile(r'ims=([A-F0-9]+)')
+
+
+def _text(node):
+    """Return the text of a node with its whitespace collapsed."""
+    return " ".join(node.text_content().split())
+
+
+def _first_text(node, selector, default):
+    """Return the text of the first match of a selector or a default value."""
+    matches = selector(node)
+    if not matches:
+        return default
+    return _text(matches[0])
+
+
+def extract_candidate_id(profile_link):
+    """Extract the candidate ID (parameter 'ims') from a profile link."""
+    if not profile_link:
+        return None
+    match = CANDIDATE_ID_PATTERN.search(profile_link)
+    return match.group(1) if match else None
+
+
+def parse_candidate_listing(page_source: str, base_url: str = None) -> list:
+    """
+    Parse the candidates of a listing page from its HTML.
+
+    Works on `driver.page_source` or on a saved HTML file and returns
+    the same dictionaries as the WebDriver based extraction.
+
+    Args:
+        page_source (str): HTML of the candidates listing page.
+        base_url (str): URL of the page, used to make profile links absolute.
+
+    Returns:
+        list: Dictionaries with the information of each candidate.
+    """
+    document = lxml_html.fromstring(page_source)
+    candidates_info = []
+
+    for article in CANDIDATE_ARTICLE(document):
+        profile_link = "Enlace no encontrado"
+        links = CANDIDATE_PROFILE_LINK(article)
+        if links and links[0].get("href"):
+            profile_link = links[0].get("href")
+            if base_url:
+                profile_link = urljoin(base_url, profile_link)
+
+        candidate_id = None
+        if profile_link != "Enlace no encontrado":
+            candidate_id = extract_candidate_id(profile_link)
+
+        candidates_info.append({
+            "name": _first_text(article, CANDIDATE_NAME, "Nombre no encontrado"),
+            "applied_date": _first_text(article, CANDIDATE_APPLIED_DATE, "Fecha no encontrada"),
+            "age": _first_text(article, CANDIDATE_AGE, "Edad no encontrada"),
+            "studies": _first_text(article, CANDIDATE_STUDIES, "Estudios no encontrados"),
+            "adequacy": _first_text(article, CANDIDATE_ADEQUACY, "Adecuación no encontrada"),
+            "profile_link": profile_link,
+            "candidate_id": candidate_id,
+        })
+
+    return candidates_info
+
+
+CANDIDATES_PAGER = CSSSelector("#pager_Pager_PageSelected")
+PAGER_LINK = CSSSelector("a")
+NEXT_PAGE_LINK = CSSSelector("a.b_next")
+
+
+def next_page_url(page_source: str, base_url: str = None):
+    """Return the URL of the 'Siguiente' link of a listing page, None on the last page."""
+    links = NEXT_PAGE_LINK(lxml_html.fromstring(page_source))
+    href = links[0].get("href") if links else None
+    if not href or href.startswith(("#", "javascript")):
+        return None
+    return urljoin(base_url, href) if base_url else href
+
+
+def _page_params(href, page):
+    """Names of the query parameters of a pager link whose value is its page number."""
+    return {
+        name for name, values in parse_qs(urlparse(href).query).items()
+        if values[0] == str(page)
+    }
+
+
+def parse_pager(page_source: str, base_url: str = None) -> dict:
+    """
+    Parse the pager of a candidates listing page.
+
+    Works on the whole page or on the HTML of the pager alone.
+
+    Args:
+        page_source (str): HTML of the listing page or of its pager.
+        base_url (str): URL of the page, used to make page links absolute.
+
+    Returns:
+        dict: `current` selected page number, `last` highest page number
+        linked, `has_next` whether there is a 'Siguiente' link,
+        `page_urls` page number -> URL of its link, and `page_param` the
+        query parameter that selects the page, None when the links do not
+        carry it. `current` and `last` are None if there is no pager.
+    """
+    pager = {"current": None, "last": None, "has_next": False, "page_urls": {}, "page_param": None}
+    pagers = CANDIDATES_PAGER(lxml_html.fromstring(page_source))
+    if not pagers:
+        return pager
+
+    # Parámetros que coinciden con el número de página en todos los enlaces
+    page_params = None
+    for link in PAGER_LINK(pagers[0]):
+        css_class = link.get("class") or ""
+        if "b_next" in css_class:
+            pager["has_next"] = True
+            continue
+        text = _text(link)
+        if not text.isdigit():
+            continue
+
+        number = int(text)
+        pager["last"] = max(pager["last"] or 0, number)
+        if "sel" in css_class:
+            pager["current"] = number
+        href = link.get("href")
+        if href and not href.startswith(("#", "javascript")):
+            pager["page_urls"][number] = urljoin(base_url, href) if base_url else href
+            params = _page_params(href, number)
+            page_params = params if page_params is None else page_params & params
+
+    # Si coincide más de un parámetro no se sabe cuál selecciona la página
+    if page_params and len(page_params) == 1:
+        pager["page_param"] = page_params.pop()
+    return pager
+
+
+# Mapeo de íconos a campos de la página de detalle del candidato
+DETAIL_ICON_MAP = {
+    "i_email": "email",
+    "i_card": "id_number",
+    "i_mobile": "mobile_phone",
+    "i_whatsapp": "whatsapp",
+    "i_flag": "location",
+    "i_partner": "marital_status",
+    "i_yes": "employment_status",
+    "i_no": "driving_license",
+    "i_money": "net_monthly_salary",
+}
+DETAIL_LINK_FIELDS = {"whatsapp"}
+
+DETAIL_ICONS = {
+    icon_class: CSSSelector(f"span.icon.{icon_class}") for icon_class in DETAIL_ICON_MAP
+}
+DETAIL_VALUE = CSSSelector("span.w100")
+DETAIL_LINK = CSSSelector("a")
+DETAIL_CV_LINK = CSSSelector("ul.mtB.table.small a.js_download_file")
+
+
+def _not_found(field):
+    return f"{field.replace('_', ' ').capitalize()} no encontrado"
+
+
+def _detail_value(document, icon_class, field, base_url):
+    """Return the value next to an icon or the 'no encontrado' fallback."""
+    icons = DETAIL_ICONS[icon_class](document)
+    if not icons:
+        return _not_found(field)
+
+    parent = next(icons[0].iterancestors("li"), None)
+    if parent is None:
+        return _not_found(field)
+
+    if field in DETAIL_LINK_FIELDS:
+        links = DETAIL_LINK(parent)
+        if not links:
+            return _not_found(field)
+        href = links[0].get("href")
+        return urljoin(base_url, href) if base_url and href else href
+
+    values = DETAIL_VALUE(parent)
+    if not values:
+        return _not_found(field)
+    return _text(values[0])
+
+
+def parse_candidate_details(page_source: str, base_url: str = None) -> dict:
+    """
+    Parse every field of a candidate detail page in a single pass.
+
+    Args:
+        page_source (str): HTML of the candidate detail page.
+        base_url (str): URL of the page, used to make links absolute.
+
+    Returns:
+        dict: Detail fields keyed as in DETAIL_ICON_MAP plus `cv_link`.
+    """
+    document = lxml_html.fromstring(page_source)
+    candidate_details = {
+        field: _detail_value(document, icon_class, field, base_url)
+        for icon_class, field in DETAIL_ICON_MAP.items()
+    }
+
+    cv_links = DETAIL_CV_LINK(document)
+    if cv_links:
+        href = cv_links[0].get("href")
+        candidate_details["cv_link"] = urljoin(base_url, href) if base_url and href else href
+    else:
+        candidate_details["cv_link"] = "CV no encontrado"
+
+    return candidate_details
+
+
+OFFER_EXPIRED = XPath("//h3[text()='Su oferta de empleo ha vencido']")
+
+
+def is_offer_expired(page_source: str) -> bool:
+    """Check whether an offer page shows the 'Su oferta de empleo ha vencido' header."""
+    return bool(OFFER_EXPIRED(lxml_html.fromstring(page_source)))
+
+
+# Selectores del listado de ofertas de la empresa
+OFFER_ARTICLE = CSSSelector("article.aClick")
+OFFER_TITLE = CSSSelector(".test_offername")
+OFFER_TITLE_FALLBACK = CSSSelector("span.fs18.lh1")
+OFFER_LOCATION = CSSSelector("p.mt5")
+OFFER_DATE_UPDATED = CSSSelector("p.fc_aux.fs12")
+OFFER_VIEWS = CSSSelector("div.fc_aux.fwB.mt5")
+OFFER_EXPIRATION_DATE = CSSSelector("div.tc_fx")
+OFFER_APPLICANTS = CSSSelector("a.dB.fwB.fs20.hide_m")
+OFFER_LINK = CSSSelector("a.fn.fs18.test_offername")
+OFFER_CHECKBOX = CSSSelector("input[type='checkbox']")
+OFFER_STATUS_EXPIRED = CSSSelector("p.fc_status_vencida")
+
+OFFER_ID_PATTERN = re.compile(r'oi=([^&#]+)')
+
+
+def _offer_id(article):
+    """Read the offer ID from the selection checkbox or, failing that, the offer link."""
+    checkboxes = OFFER_CHECKBOX(article)
+    if checkboxes and "chk_" in (checkboxes[0].get("id") or ""):
+        return checkboxes[0].get("id").split("chk_")[1]
+
+    links = OFFER_LINK(article)
+    if links:
+        match = OFFER_ID_PATTERN.search(links[0].get("href") or "")
+        if match:
+            return match.group(1)
+    return "ID no encontrado"
+
+
+def parse_offer_listing(page_source: str, base_url: str = None) -> list:
+    """
+    Parse every offer of a page of the company offers listing in one pass.
+
+    Returns the same dictionaries as reading each `article.aClick` through
+    WebDriver.
+
+    Args:
+        page_source (str): HTML of the offers listing page.
+        base_url (str): URL of the page, used to make applicant links absolute.
+
+    Returns:
+        list: Dictionaries with the information of each offer.
+    """
+    document = lxml_html.fromstring(page_source)
+    offers = []
+
+    for article in OFFER_ARTICLE(document):
+        title = _first_text(article, OFFER_TITLE, None)
+        if title is None:
+            title = _first_text(article, OFFER_TITLE_FALLBACK, "Título no encontrado")
+
+        views_text = _first_text(article, OFFER_VIEWS, "")
+
+        applicants = "0"
+        applicants_link = "Enlace no encontrado"
+        applicants_elements = OFFER_APPLICANTS(article)
+        if applicants_elements:
+            applicants = _text(applicants_elements[0])
+            applicants_link = applicants_elements[0].get("href") or applicants_link
+            if base_url and applicants_link != "Enlace no encontrado":
+                applicants_link = urljoin(base_url, applicants_link)
+
+        offers.append({
+            "title": title,
+            "location": _first_text(article, OFFER_LOCATION, "Ubicación no encontrada"),
+            "date_updated": _first_text(article, OFFER_DATE_UPDATED, "Fecha no encontrada"),
+            "views": views_text.split()[0] if views_text else "0",
+            "expiration_date": _first_text(article, OFFER_EXPIRATION_DATE, "Fecha no encontrada"),
+            "applicants": applicants,
+            "applicants_link": applicants_link,
+            "offer_id": _offer_id(article),
+            "status": "Vencida" if OFFER_STATUS_EXPIRED(article) else "Activa",
+        })
+
+    return offers
@@ -0,0 +1,62 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from ...core.config import settings
+
+OFFER_ARTICLES = (By.CSS_SELECTOR, "article.aClick")
+CANDIDATE_ARTICLES = (By.CSS_SELECTOR, "article.rowuser")
+CANDIDATES_PAGER = (By.ID, "pager_Pager_PageSelected")
+CANDIDATE_DETAILS = (By.CSS_SELECTOR, "ul.mtB.table.small")
+EXPIRED_OFFER_HEADER = (By.XPATH, "//h3[text()='Su oferta de empleo ha vencido']")
+
+
+def empty_offer_page(driver):
+    """
+    Whether the page finished loading without any candidate.
+
+    An offer nobody applied to has no pager and no candidate cards, so the
+    other conditions of an offer page never match it.
+    """
+    return (
+        driver.execute_script("return document.readyState") == "complete"
+        and not driver.find_elements(*CANDIDATE_ARTICLES)
+    )
+
+
+# Tipo de página -> elementos que deben estar en el DOM para poder leerla
+READY_CONDITIONS = {
+    "offers": EC.presence_of_all_elements_located(OFFER_ARTICLES),
+    "offer": EC.any_of(
+        EC.presence_of_element_located(CANDIDATES_PAGER),
+        EC.presence_of_element_located(CANDIDATE_ARTICLES),
+        EC.presence_of_element_located(EXPIRED_OFFER_HEADER),
+        empty_offer_page,
+    ),
+    "candidates": EC.presence_of_all_elements_located(CANDIDATE_ARTICLES),
+    "pager": EC.presence_of_element_located(CANDIDATES_PAGER),
+    "candidate_details": EC.presence_of_element_located(CANDIDATE_DETAILS),
+}
+
+
+def wait_until_ready(driver, page: str, timeout: float = None):
+    """
+    Wait until a page can be read, instead of waiting for its full load.
+
+    The browsers use the eager page load strategy, so `driver.get` returns
+    once the DOM is parsed and images, fonts and scripts may still be
+    loading. This waits only for the elements the scrapers read.
+
+    Args:
+        driver: Instance of Selenium WebDriver.
+        page (str): Key of READY_CONDITIONS.
+        timeout (float): Seconds to wait, by default SCRAPER_READY_TIMEOUT.
+
+    Returns:
+        The value of the condition, usually the elements found.
+
+    Raises:
+        TimeoutException: If the page is not ready in time.
+    """
+    wait = WebDriverWait(driver, timeout or settings.SCRAPER_READY_TIMEOUT)
+    return wait.until(READY_CONDITIONS[page])
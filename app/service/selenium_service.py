@@ -1,126 +1,334 @@
+import asyncio
 import time
-import random
 import traceback
 
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import pickle
 
+from ..core.config import settings
 from ..core.logger_config import logger
-from ..core.selenium import driver
+from ..core.metrics import SCRAPE_RETRIES, SCRAPE_TIMEOUTS, scrape_labels
+from ..core.pacing import get_pacer, run_blocking
+from ..core.selenium import get_driver_pool
+from ..db.database import SessionLocal
+from .job_service import record_job_progress
+from .offer_service import offer_snapshot, save_offers_batch
+from .user_service import get_user_by_email
+from .scraping_service.http_fetcher import SessionFetcher
 from .scraping_service.job_candidates import process_pagination
+from .scraping_service.parsers import next_page_url, parse_offer_listing
+from .scraping_service.readiness import EXPIRED_OFFER_HEADER, wait_until_ready
+from .session_cache import ensure_session, recheck_session
+from ..utils.utils import drop_expired, extract_offer_id
 
+LOGIN_URL = f"{settings.COMPUTRABAJO_BASE_URL}/Login"
+OFFERS_LISTING_URL = f"{settings.COMPUTRABAJO_BASE_URL}/Company/Offers"
 
-async def load_cookies(driver):
-    """Load cookies from a file if they exist."""
-    try:
-        cookies = pickle.load(open("cookies.pkl", "rb"))
-        domain = "empresa.co.computrabajo.com"
-        if domain in driver.current_url:
-            for cookie in cookies:
-                driver.add_cookie(cookie)
-            logger.info("Cookies cargadas exitosamente.")
-        else:
-            logger.info(f"No se pueden cargar cookies en el dominio actual: {driver.current_url}")
-    except FileNotFoundError:
-        logger.error("No se encontraron cookies guardadas. Realizando login manual.")
-        
 
-async def save_cookies(driver):
-    """Save the current cookies in a file."""
-    try:
-        cookies = driver.get_cookies()
-        pickle.dump(cookies, open("cookies.pkl", "wb"))
-        logger.info("Cookies guardadas exitosamente.")
-    except Exception as e:
-        logger.error(f"Error al guardar cookies: {e}")
+def _fill_login_form(driver, username, password):
+    driver.get(LOGIN_URL)
+
+    # Esperar hasta que los campos de usuario y contraseña sean visibles
+    wait = WebDriverWait(driver, 10)
+    usuario = wait.until(EC.visibility_of_element_located((By.NAME, 'UserName')))
+    contraseña = wait.until(EC.visibility_of_element_located((By.NAME, 'Password')))
+
+    logger.info("Ingresando credenciales...")
+    usuario.send_keys(username)
+    contraseña.send_keys(password)
+
+
+def _submit_login_form(driver):
+    login_button = driver.find_element(By.CSS_SELECTOR, "input[value='Entrar']")
+    login_button.click()
+
+    WebDriverWait(driver, 10).until(EC.url_changes(driver.current_url))
+    return driver.current_url
         
         
 async def doing_login(driver, username, password):
-    """Perform login with the provided credentials."""
+    """Perform login with the provided credentials.
+
+    Returns:
+        bool: True if the site accepted the credentials.
+    """
+    pacer = get_pacer()
     try:
         logger.info("Accediendo a la página de login...")
-        driver.get("https://empresa.co.computrabajo.com/Login")
-        
-        # Esperar hasta que los campos de usuario y contraseña sean visibles
-        wait = WebDriverWait(driver, 10)
-        usuario = wait.until(EC.visibility_of_element_located((By.NAME, 'UserName')))
-        contraseña = wait.until(EC.visibility_of_element_located((By.NAME, 'Password')))
-
-        logger.info("Ingresando credenciales...")
-        usuario.send_keys(username)
-        contraseña.send_keys(password)
-        time.sleep(1)
+        await pacer.wait(LOGIN_URL)
+        await run_blocking(_fill_login_form, driver, username, password)
+        await pacer.wait_page(LOGIN_URL)
 
         logger.info("Haciendo clic en el botón de login...")
-        login_button = driver.find_element(By.CSS_SELECTOR, "input[value='Entrar']")
-        login_button.click()
+        current_url = await run_blocking(_submit_login_form, driver)
 
-        WebDriverWait(driver, 10).until(EC.url_changes(driver.current_url))
+        if "Login" not in current_url:
+            logger.info(f"Login exitoso. URL actual: {current_url}")
+            return True
+        logger.error(f"Login fallido. URL actual: {current_url}")
+        return False
 
-        if "Login" not in driver.current_url:
-            logger.info("Login exitoso. URL actual:", driver.current_url)
-            await save_cookies(driver)
-        else:
-            logger.error("Login fallido. URL actual:", driver.current_url)
-            
     except Exception as e:
             logger.error(f"Error al realizar login: {e}")
-            # Si el login falla, intentar de nuevo con los cookies guardados
-            await load_cookies(driver)
-            if "Login" in driver.current_url:
-                logger.info("Reintentando login...")
-                await doing_login(driver, username, password)
+            return False
+
+
+async def login_account(driver, email, password):
+    """Authenticate a browser with the cached session of the account, logging in only if needed."""
+    if not await ensure_session(driver, email, password, doing_login):
+        raise RuntimeError(f"No fue posible iniciar sesión con la cuenta {email}")
+
+
+def _is_offer_expired(driver):
+    try:
+        element = driver.find_element(*EXPIRED_OFFER_HEADER)
+        texto_encontrado = element.text
+        if texto_encontrado:
+            logger.info(texto_encontrado)
+        return True
+    except Exception:
+        return False
 
     
-async def get_offers(driver, list_offers):
-    """Validate the links of the offers."""
-    validate_links = []
+# (cuenta, url) -> (vigente, instante de expiración), otra cuenta puede no ver la oferta
+_offer_validation_cache = {}
+
+
+def _load_offer_page(driver, url):
+    """Open an offer, True if it was ready in time."""
+    driver.get(url)
+    try:
+        # El encabezado de vencida o el listado de candidatos, lo que aparezca primero
+        wait_until_ready(driver, "offer")
+        return True
+    except TimeoutException:
+        return False
+
+
+async def _is_offer_expired_in_browser(driver, url, account=None):
+    await get_pacer().wait_page(url)
+    if not await run_blocking(_load_offer_page, driver, url):
+        logger.warning(f"La oferta {url} no cargó en {settings.SCRAPER_READY_TIMEOUT} segundos.")
+        SCRAPE_TIMEOUTS.labels(**scrape_labels(account)).inc()
+    return await run_blocking(_is_offer_expired, driver)
+
     
-    for offer in list_offers.offers: 
-        url = offer.url
-        logger.info(f"Abriendo el enlace de la oferta: {url}")
-        
-        driver.get(url)
-        WebDriverWait(driver, 10)
-        
-        logger.info("Verificando si la oferta está vencida...")
-        time.sleep(random.uniform(3, 5))  
-        try:
-            element = driver.find_element(By.XPATH, "//h3[text()='Su oferta de empleo ha vencido']")
-            texto_encontrado = element.text
-            if texto_encontrado:
-                logger.info(texto_encontrado)
-                logger.info(f"La oferta {url} está vencida..")
-        except Exception:
+async def get_offers(driver, list_offers, email):
+    """Validate the links of the offers.
+
+    The offers are checked concurrently over HTTP with the session cookies
+    of the driver, falling back to the browser when a page cannot be
+    loaded. Results are cached per account and URL for
+    SCRAPER_OFFER_VALIDATION_TTL seconds.
+
+    Args:
+        driver: Instance of Selenium WebDriver logged in with the account.
+        list_offers: Offers to validate.
+        email: Account the driver is logged in with.
+    """
+    urls = list(dict.fromkeys(offer.url for offer in list_offers.offers))
+    now = time.monotonic()
+    results = {
+        url: _offer_validation_cache[(email, url)][0]
+        for url in urls
+        if (email, url) in _offer_validation_cache and _offer_validation_cache[(email, url)][1] > now
+    }
+    pending_urls = [url for url in urls if url not in results]
+    if results:
+        logger.info(f"{len(results)} ofertas ya validadas, se usan los resultados guardados.")
+
+    if pending_urls:
+        logger.info(f"Verificando si {len(pending_urls)} ofertas están vencidas...")
+        cookies = await run_blocking(driver.get_cookies)
+        async with SessionFetcher(cookies) as fetcher:
+            expired_flags = await asyncio.gather(
+                *[fetcher.is_offer_expired(url) for url in pending_urls]
+            )
+
+        # Las entradas vencidas se descartan para que la caché no crezca sin límite
+        drop_expired(_offer_validation_cache, time.monotonic())
+        for url, expired in zip(pending_urls, expired_flags):
+            if expired is None:
+                logger.info(f"Abriendo el enlace de la oferta en el navegador: {url}")
+                expired = await _is_offer_expired_in_browser(driver, url, email)
+            results[url] = not expired
+            _offer_validation_cache[(email, url)] = (
+                not expired,
+                time.monotonic() + settings.SCRAPER_OFFER_VALIDATION_TTL,
+            )
+
+    validate_links = []
+    for url in urls:
+        if results[url]:
             logger.info(f"La oferta {url} no está vencida..")
             validate_links.append(url)
+        else:
+            logger.info(f"La oferta {url} está vencida..")
     
     return validate_links
 
 
-async def flujo_principal(db, email: str, password: str, list_offers):
-    """Take control of the entire process."""
+def _get_user_id(email):
+    db = SessionLocal()
     try:
-        logger.info("Iniciando extracción de candidatos...")    
-        
-        await doing_login(driver, email, password)
-        
-        list_offers = await get_offers(driver, list_offers)
-        
-        wait = WebDriverWait(driver, 10)
-        
+        user = get_user_by_email(db, email)
+        return user.id if user else None
+    finally:
+        db.close()
+
+
+def _parse_offers_page(page_source, url):
+    return parse_offer_listing(page_source, url), next_page_url(page_source, url)
+
+
+async def read_offer_snapshots(driver, email, urls) -> dict:
+    """
+    Read the live applicants count and last update of the offers of a job.
+
+    Walks the offers listing of the account over HTTP, following its
+    'Siguiente' link until every offer was seen, and refreshes the offer
+    rows with `save_offers_batch` on the way.
+
+    Args:
+        driver: Logged in Selenium WebDriver, only its cookies are used.
+        email (str): Account of the job, owner of new offer rows.
+        urls (list): URLs of the offers of the job.
+
+    Returns:
+        dict: offer_id -> snapshot, see `offer_snapshot`. Offers that were
+        not found in the listing are missing.
+    """
+    pending_ids = {extract_offer_id(url) for url in urls} - {None}
+    user_id = await run_blocking(_get_user_id, email)
+    snapshots = {}
+    cookies = await run_blocking(driver.get_cookies)
+    async with SessionFetcher(cookies, concurrency=1) as fetcher:
+        url, visited = OFFERS_LISTING_URL, set()
+        while url and pending_ids and url not in visited:
+            visited.add(url)
+            response = await fetcher.fetch_html(url, page="offers")
+            if response is None:
+                break
+            offers, url = await run_blocking(_parse_offers_page, response.text, str(response.url))
+            if not offers:
+                break
+            if user_id is not None:
+                await save_offers_batch(offers, user_id)
+            for offer in offers:
+                if offer["offer_id"] in pending_ids:
+                    pending_ids.discard(offer["offer_id"])
+                    snapshots[offer["offer_id"]] = offer_snapshot(offer)
+
+    if pending_ids:
+        logger.info(f"{len(pending_ids)} ofertas no aparecen en el listado, se revisarán completas.")
+    return snapshots
+
+
+async def _offers_worker(
+    pool, pending_offers, email, password, job_id, incremental, blocking, snapshots, failed_offers
+):
+    """Take offers from the queue and paginate them with one pool driver.
+
+    An offer that does not finish, usually because the browser crashed, is
+    retried in a new browser and resumes from its checkpoint.
+    """
+    driver = None
+    try:
+        while True:
+            try:
+                url = pending_offers.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+
+            completed = False
+            for attempt in range(1, settings.SCRAPER_OFFER_ATTEMPTS + 1):
+                try:
+                    if driver is None:
+                        driver = await pool.acquire(blocking)
+                        await login_account(driver, email, password)
+                    completed = await process_pagination(
+                        driver, WebDriverWait(driver, 10), url, job_id, incremental,
+                        snapshots.get(extract_offer_id(url)), email,
+                    )
+                except Exception as e:
+                    logger.error(f"Error procesando la oferta {url}: {e}")
+                if completed:
+                    break
+
+                logger.info(f"La oferta {url} no terminó (intento {attempt}), se reinicia el navegador.")
+                if attempt < settings.SCRAPER_OFFER_ATTEMPTS:
+                    SCRAPE_RETRIES.labels(**scrape_labels(email)).inc()
+                    await asyncio.to_thread(record_job_progress, job_id, retries=1)
+                # La sesión pudo caducar durante la oferta
+                recheck_session(email)
+                # El navegador puede responder con una página colgada, no se reutiliza
+                if driver is not None:
+                    await pool.discard(driver)
+                    driver = None
+
+            if not completed:
+                failed_offers.append(url)
+            await asyncio.to_thread(record_job_progress, job_id, offers=1)
+    finally:
+        if driver is not None:
+            pool.release(driver)
+
+
+async def flujo_principal(db, email: str, password: str, list_offers, job_id=None):
+    """Take control of the entire process.
+
+    Args:
+        job_id: Scrape job that tracks the progress of this run, if any.
+    """
+    pool = get_driver_pool()
+    try:
+        logger.info("Iniciando extracción de candidatos...")
+
+        blocking = list_offers.resource_blocking
+        async with pool.session(blocking) as driver:
+            await login_account(driver, email, password)
+            total_offers = len(list_offers.offers)
+            incremental = list_offers.incremental
+            list_offers = await get_offers(driver, list_offers, email)
+            # Valores del listado de ofertas, los de la tabla pueden estar desactualizados.
+            # Solo el scraping incremental los usa para planificar
+            snapshots = {}
+            if incremental:
+                snapshots = await read_offer_snapshots(driver, email, list_offers)
+
+        # Las ofertas vencidas cuentan como procesadas
+        await asyncio.to_thread(
+            record_job_progress, job_id, offers=total_offers - len(list_offers)
+        )
+
+        pending_offers = asyncio.Queue()
         for url in list_offers:
-            await process_pagination(driver, wait, url)
+            pending_offers.put_nowait(url)
+
+        # Cada navegador recibe las cookies de la sesión guardada de la cuenta
+        failed_offers = []
+        workers = min(pool.size, len(list_offers))
+        await asyncio.gather(
+            *[
+                _offers_worker(
+                    pool, pending_offers, email, password, job_id, incremental, blocking,
+                    snapshots, failed_offers,
+                )
+                for _ in range(workers)
+            ]
+        )
+
+        if failed_offers:
+            raise RuntimeError(
+                f"No se completaron {len(failed_offers)} ofertas: {', '.join(failed_offers)}"
+            )
 
     except Exception as e:
         error_message = f"Error en el flujo principal: {str(e)}"
         logger.error(error_message)
         logger.error(f"Traceback: {traceback.format_exc()}")
+        raise
     finally:
         logger.info("No hay más candidatos para procesar.") 
-        logger.info("Cerrando navegador...")
-        driver.close()
-        driver.quit()
-        
\ No newline at end of file
@@ -0,0 +1,154 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+from ..core.config import settings
+from ..core.logger_config import logger
+from ..core.pacing import get_pacer, run_blocking
+from .scraping_service.http_fetcher import SessionFetcher
+
+# Página protegida y ligera para comprobar si una sesión sigue activa
+SESSION_CHECK_URL = f"{settings.COMPUTRABAJO_BASE_URL}/Company"
+# Recurso estático del dominio, el navegador debe estar en él para recibir cookies
+COOKIE_DOMAIN_URL = f"{settings.COMPUTRABAJO_BASE_URL}/robots.txt"
+
+# clave de la cuenta -> {"cookies", "expires_at", "checked_until"}
+_sessions = {}
+_account_locks = {}
+
+
+def _account_key(email: str) -> str:
+    """Key of an account in the cache, the account email is never stored in clear."""
+    return hashlib.sha256(email.strip().lower().encode()).hexdigest()
+
+
+def _session_path(key: str) -> str:
+    return os.path.join(settings.SCRAPER_SESSION_DIR, f"{key}.json")
+
+
+def _session_expiry(cookies: list) -> float:
+    """The session ends when its first cookie with an expiry ends, at most after SCRAPER_SESSION_TTL."""
+    expires_at = time.time() + settings.SCRAPER_SESSION_TTL
+    expiries = [cookie["expiry"] for cookie in cookies if cookie.get("expiry")]
+    return min([expires_at] + expiries)
+
+
+def _read_session(key: str):
+    session = _sessions.get(key)
+    if session is None:
+        try:
+            with open(_session_path(key), encoding="utf-8") as file:
+                session = json.load(file)
+        except (OSError, ValueError):
+            return None
+        session["checked_until"] = 0
+        _sessions[key] = session
+
+    if session["expires_at"] <= time.time():
+        _drop_session(key)
+        return None
+    return session
+
+
+def _write_session(key: str, cookies: list):
+    session = {"cookies": cookies, "expires_at": _session_expiry(cookies)}
+    os.makedirs(settings.SCRAPER_SESSION_DIR, exist_ok=True)
+    path = _session_path(key)
+    # Las cookies dan acceso a la cuenta: solo el usuario del proceso puede leerlas
+    descriptor = os.open(f"{path}.tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+        json.dump(session, file)
+    os.replace(f"{path}.tmp", path)
+
+    session["checked_until"] = time.monotonic() + settings.SCRAPER_SESSION_CHECK_INTERVAL
+    _sessions[key] = session
+
+
+def _drop_session(key: str):
+    _sessions.pop(key, None)
+    try:
+        os.remove(_session_path(key))
+    except FileNotFoundError:
+        pass
+
+
+def _apply_cookies(driver, cookies: list):
+    """Replace the cookies of the browser with the ones of the cached session."""
+    driver.get(COOKIE_DOMAIN_URL)
+    driver.delete_all_cookies()
+    for cookie in cookies:
+        driver.add_cookie(cookie)
+
+
+def _clear_cookies(driver):
+    """Drop the session a pooled browser may keep from another account."""
+    driver.get(COOKIE_DOMAIN_URL)
+    driver.delete_all_cookies()
+
+
+def recheck_session(email: str):
+    """Validate the cached session of an account again before its next use."""
+    session = _sessions.get(_account_key(email))
+    if session is not None:
+        session["checked_until"] = 0
+
+
+async def _is_session_alive(cookies: list) -> bool:
+    """Check the session with a single authenticated HTTP request."""
+    async with SessionFetcher(cookies, concurrency=1) as fetcher:
+        return await fetcher.fetch_html(SESSION_CHECK_URL, page="session") is not None
+
+
+async def ensure_session(driver, email: str, password: str, login) -> bool:
+    """
+    Give a browser an authenticated session of an account.
+
+    The cookies of the last login of the account are reused while they are
+    not expired and the site still accepts them, so the login form is only
+    filled when the cached session is missing or rejected. Sessions are
+    saved in SCRAPER_SESSION_DIR, keyed by a hash of the account email, and
+    shared by the pool workers and the worker processes.
+
+    Args:
+        driver: Instance of Selenium WebDriver.
+        email (str): Account used to log in.
+        password (str): Password of the account.
+        login: Coroutine function `login(driver, email, password) -> bool`
+            that fills the login form.
+
+    Returns:
+        bool: True if the browser has an authenticated session.
+    """
+    key = _account_key(email)
+    # Un solo login a la vez por cuenta, los demás workers reutilizan su sesión
+    lock = _account_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        session = await run_blocking(_read_session, key)
+        if session is not None:
+            alive = session["checked_until"] > time.monotonic()
+            if not alive:
+                alive = await _is_session_alive(session["cookies"])
+            if alive:
+                session["checked_until"] = time.monotonic() + settings.SCRAPER_SESSION_CHECK_INTERVAL
+                await get_pacer().wait(COOKIE_DOMAIN_URL)
+                await run_blocking(_apply_cookies, driver, session["cookies"])
+                logger.info("Sesión guardada reutilizada, se omite el login.")
+                return True
+
+            logger.info("La sesión guardada fue rechazada, se inicia sesión de nuevo.")
+            await run_blocking(_drop_session, key)
+
+        await get_pacer().wait(COOKIE_DOMAIN_URL)
+        await run_blocking(_clear_cookies, driver)
+        if not await login(driver, email, password):
+            return False
+
+        cookies = await run_blocking(driver.get_cookies)
+        try:
+            await run_blocking(_write_session, key, cookies)
+            logger.info("Sesión guardada para los siguientes trabajos.")
+        except OSError as e:
+            logger.error(f"Error al guardar la sesión: {e}")
+        return True
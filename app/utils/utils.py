@@ -1,4 +1,4 @@
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlencode, urlparse, urlunparse, parse_qs
 
 def extract_offer_id(url):
     """
@@ -12,4 +12,33 @@ def extract_offer_id(url):
     """
     parsed_url = urlparse(url)
     query_params = parse_qs(parsed_url.query)
-    return query_params.get('oi', [None])[0]
\ No newline at end of file
+    return query_params.get('oi', [None])[0]
+
+def build_page_url(url, page_param, page):
+    """
+    Build the URL of a listing page by setting its page query parameter.
+
+    Args:
+        url (str): URL of any page of the listing.
+        page_param (str): Name of the page parameter, such as 'p'.
+        page (int): Page number.
+
+    Returns:
+        str: The URL with the other query parameters kept.
+    """
+    parsed_url = urlparse(url)
+    query_params = parse_qs(parsed_url.query, keep_blank_values=True)
+    query_params[page_param] = [str(page)]
+    return urlunparse(parsed_url._replace(query=urlencode(query_params, doseq=True)))
+
+
+def drop_expired(cache, now):
+    """
+    Remove the expired entries of a cache whose values are (value, expires_at).
+
+    Args:
+        cache (dict): The cache, changed in place.
+        now (float): Current `time.monotonic()`.
+    """
+    for key in [key for key, (_, expires_at) in cache.items() if expires_at <= now]:
+        del cache[key]
@@ -0,0 +1,32 @@
+import asyncio
+
+from prometheus_client import start_http_server
+
+from .core.config import settings
+from .core.logger_config import logger
+from .core.metrics import metrics_registry
+from .core.selenium import close_driver_pool
+from .db.models.init_db import init_db
+from .service.scrape_worker import get_worker_pool
+
+
+async def main():
+    """Run the scrape job workers outside of the API process."""
+    init_db()
+    if settings.SCRAPER_WORKER_METRICS_PORT:
+        # El worker no sirve la API, expone sus métricas en un puerto propio
+        start_http_server(settings.SCRAPER_WORKER_METRICS_PORT, registry=metrics_registry())
+    worker_pool = get_worker_pool()
+    await worker_pool.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await worker_pool.stop()
+        close_driver_pool()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("Workers de scraping detenidos.")
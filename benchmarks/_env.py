@@ -0,0 +1,29 @@
+"""Settings needed to import the app outside of a deployment.
+
+The benchmarks build their own engines, so these placeholders only have
+to satisfy the required fields of `app.core.config.Settings`.
+"""
+import os
+
+PLACEHOLDER_SETTINGS = {
+    "API_KEY_TOKEN": "benchmark",
+    "FASTAPI_ENV": "development",
+    "DB_HOST": "localhost",
+    "DB_PORT": "3306",
+    "DB_DATABASE": "benchmark",
+    "DB_USERNAME": "benchmark",
+    "DB_PASSWORD": "benchmark",
+    "AWS_ACCESS_KEY_ID": "benchmark",
+    "AWS_SECRET_ACCESS_KEY": "benchmark",
+    "AWS_DEFAULT_REGION": "benchmark",
+    "AWS_BUCKET": "benchmark",
+    "OPENAI_API_KEY": "benchmark",
+    "SECRET_KEY": "benchmark",
+    "REFRESH_SECRET_KEY": "benchmark",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+}
+
+for key, value in PLACEHOLDER_SETTINGS.items():
+    os.environ.setdefault(key, value)
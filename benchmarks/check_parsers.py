@@ -0,0 +1,101 @@
+"""Check the pager parser against markup that the replay server does not generate.
+
+The replay server builds its pager with the same `p` parameter the scraper
+then finds in it, so the benchmarks alone cannot tell whether `parse_pager`
+would read the pager of the real site. These snippets follow the markup of
+the site's candidates pager that the scraper has always selected on: the
+`#pager_Pager_PageSelected` container, the `sel` link of the current page
+and the `b_next` 'Siguiente' link. They add the variations a live page can
+show: other query parameters whose value looks like a page number, a
+previous page link, gaps in the page numbers and postback links. When the
+markup of the site changes, paste the new pager here. Exits with status 1
+when a field is not parsed as expected:
+
+    python -m benchmarks.check_parsers
+"""
+import sys
+
+from . import _env  # noqa: F401
+
+from app.service.scraping_service.parsers import parse_pager
+from app.utils.utils import build_page_url
+
+BASE_URL = "https://empresa.co.computrabajo.com/Company/Candidates?oi=3F2A1B&cf=2"
+
+# Página 2 de 12, el filtro cf=2 coincide con el número de la página actual
+QUERY_PAGER = """
+<div class="pag_numeric" id="pager_Pager_PageSelected">
+  <a class="b_prev" href="/Company/Candidates?oi=3F2A1B&amp;cf=2&amp;p=1" title="Anterior"><span>Anterior</span></a>
+  <a href="/Company/Candidates?oi=3F2A1B&amp;cf=2&amp;p=1">1</a>
+  <a class="sel" href="/Company/Candidates?oi=3F2A1B&amp;cf=2&amp;p=2">2</a>
+  <a href="/Company/Candidates?oi=3F2A1B&amp;cf=2&amp;p=3">3</a>
+  <span class="dots">...</span>
+  <a href="/Company/Candidates?oi=3F2A1B&amp;cf=2&amp;p=12">12</a>
+  <a class="b_next" href="/Company/Candidates?oi=3F2A1B&amp;cf=2&amp;p=3" title="Siguiente"><span>Siguiente</span></a>
+</div>
+"""
+
+# Última página, el parámetro de la página no se llama p
+LAST_PAGE_PAGER = """
+<div class="pag_numeric" id="pager_Pager_PageSelected">
+  <a href="Candidates?oi=3F2A1B&amp;pg=3">3</a>
+  <a href="Candidates?oi=3F2A1B&amp;pg=4">4</a>
+  <a class="sel" href="#">5</a>
+</div>
+"""
+
+# Enlaces de postback, solo se puede avanzar con el botón 'Siguiente'
+POSTBACK_PAGER = """
+<div class="pag_numeric" id="pager_Pager_PageSelected">
+  <a class="sel" href="javascript:__doPostBack('pager$Pager','1')">1</a>
+  <a href="javascript:__doPostBack('pager$Pager','2')">2</a>
+  <a class="b_next" href="javascript:__doPostBack('pager$Pager','2')"><span>Siguiente</span></a>
+</div>
+"""
+
+# (nombre, html, campo, valor esperado)
+CHECKS = (
+    ("página actual", QUERY_PAGER, "current", 2),
+    ("última página enlazada", QUERY_PAGER, "last", 12),
+    ("botón 'Siguiente'", QUERY_PAGER, "has_next", True),
+    ("parámetro de la página", QUERY_PAGER, "page_param", "p"),
+    ("enlaces absolutos", QUERY_PAGER, "page_urls", {
+        1: "https://empresa.co.computrabajo.com/Company/Candidates?oi=3F2A1B&cf=2&p=1",
+        2: "https://empresa.co.computrabajo.com/Company/Candidates?oi=3F2A1B&cf=2&p=2",
+        3: "https://empresa.co.computrabajo.com/Company/Candidates?oi=3F2A1B&cf=2&p=3",
+        12: "https://empresa.co.computrabajo.com/Company/Candidates?oi=3F2A1B&cf=2&p=12",
+    }),
+    ("última página actual", LAST_PAGE_PAGER, "current", 5),
+    ("última página sin 'Siguiente'", LAST_PAGE_PAGER, "has_next", False),
+    ("otro parámetro de la página", LAST_PAGE_PAGER, "page_param", "pg"),
+    ("postback actual", POSTBACK_PAGER, "current", 1),
+    ("postback con 'Siguiente'", POSTBACK_PAGER, "has_next", True),
+    ("postback sin parámetro", POSTBACK_PAGER, "page_param", None),
+    ("postback sin enlaces", POSTBACK_PAGER, "page_urls", {}),
+    ("sin paginador", "<div></div>", "current", None),
+)
+
+
+def main():
+    failures = 0
+    for name, html, field, expected in CHECKS:
+        value = parse_pager(html, BASE_URL)[field]
+        ok = value == expected
+        failures += not ok
+        print(f"[{'OK' if ok else 'FALLO'}] {name}: {field}={value!r}")
+        if not ok:
+            print(f"       esperado {expected!r}")
+
+    # La página se construye cambiando solo su parámetro
+    pager = parse_pager(QUERY_PAGER, BASE_URL)
+    url = build_page_url(BASE_URL, pager["page_param"], 7)
+    expected = "https://empresa.co.computrabajo.com/Company/Candidates?oi=3F2A1B&cf=2&p=7"
+    ok = url == expected
+    failures += not ok
+    print(f"[{'OK' if ok else 'FALLO'}] página 7 por parámetro: {url}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
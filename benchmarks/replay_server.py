@@ -0,0 +1,285 @@
+"""Local stand-in for the computrabajo company site.
+
+Serves the login form, the offers listing, the candidates listing with its
+pager and the candidate detail pages, with a configurable latency, so the
+scraping code can run against it by pointing COMPUTRABAJO_BASE_URL to the
+server. The markup reproduces the elements the scrapers select on (the
+`article.aClick` and `article.rowuser` cards, `#pager_Pager_PageSelected`,
+`ul.mtB.table.small` and its icons); the data is generated and stable
+between runs.
+
+    python -m benchmarks.replay_server --port 8765 --latency 0.2
+"""
+import argparse
+import random
+import threading
+import time
+from html import escape
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+SESSION_COOKIE = "replay_session"
+SESSION_TOKEN = "replay-token"
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body>{body}</body></html>"""
+
+LOGIN_FORM = """<form method="post" action="/Login">
+<input type="text" name="UserName"><input type="password" name="Password">
+<input type="submit" value="Entrar"></form>"""
+
+OFFER_ARTICLE = """<article class="aClick">
+<input type="checkbox" id="chk_{offer_id}">
+<a class="fn fs18 test_offername" href="/Company/Candidates?oi={offer_id}">Oferta {number}</a>
+<p class="mt5">Bogotá, D.C.</p>
+<p class="fc_aux fs12">Actualizada hace {number} días</p>
+<div class="fc_aux fwB mt5">{views} vistas</div>
+<div class="tc_fx">31/12/2026</div>
+<a class="dB fwB fs20 hide_m" href="/Company/Candidates?oi={offer_id}">{applicants}</a>
+</article>"""
+
+CANDIDATE_ARTICLE = """<article class="rowuser">
+<a class="js-o-link nom" href="/Candidate/Detail?oi={offer_id}&amp;ims={candidate_id}">
+<span class="w75_ms">Candidato {candidate_id}</span></a>
+<ul><li class="aplicado">Hace {days} días</li><li class="edad">{age} años</li>
+<li class="estudios">Universitario</li>
+<li class="adecuacion"><p class="fs_24">{adequacy}%</p></li></ul>
+</article>"""
+
+DETAIL_ROW = '<li><span class="icon {icon}"></span><span class="w100">{value}</span></li>'
+
+DETAIL_PAGE = """<ul class="mtB table small">
+{rows}
+<li><span class="icon i_whatsapp"></span><a href="https://wa.me/573000{index:06d}">WhatsApp</a></li>
+<li><a class="js_download_file" href="/Candidate/Cv?ims={candidate_id}">Hoja de vida</a></li>
+</ul>"""
+
+
+def _offer_id(number: int) -> str:
+    return f"OF{number:06d}"
+
+
+def _candidate_id(offer_id: str, index: int) -> str:
+    return f"{int(offer_id[2:]):04X}{index:06X}"
+
+
+def _pager(path: str, params: dict, page: int, pages: int, element_id: str = None) -> str:
+    """Pager with one link per page and a 'Siguiente' link except on the last page."""
+    links = []
+    for number in range(1, pages + 1):
+        href = escape(f"{path}?{urlencode({**params, 'p': number})}")
+        css_class = "sel" if number == page else "pag"
+        links.append(f'<a class="{css_class}" href="{href}">{number}</a>')
+    if page < pages:
+        href = escape(f"{path}?{urlencode({**params, 'p': page + 1})}")
+        links.append(f'<a class="b_next" href="{href}"><span>Siguiente</span></a>')
+    id_attribute = f' id="{element_id}"' if element_id else ""
+    return f'<div class="pag_numeric"{id_attribute}>{"".join(links)}</div>'
+
+
+class ReplayServer:
+    """ Threaded HTTP server that replays the pages of the company site.
+
+    Args:
+        offers (int): Offers of the account.
+        offers_per_page (int): Offers per page of the offers listing.
+        pages_per_offer (int): Pages of the candidates listing of each offer.
+        candidates_per_page (int): Candidates per listing page.
+        latency (float): Seconds added to every response.
+        jitter (float): Extra random latency, up to this many seconds.
+        port (int): Port to listen on, 0 picks a free one.
+    """
+
+    def __init__(self, offers=5, offers_per_page=20, pages_per_offer=3,
+                 candidates_per_page=20, latency=0.0, jitter=0.0, port=0):
+        self.offers = offers
+        self.offers_per_page = offers_per_page
+        self.pages_per_offer = pages_per_offer
+        self.candidates_per_page = candidates_per_page
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def offer_url(self, number: int) -> str:
+        return f"{self.base_url}/Company/Candidates?oi={_offer_id(number)}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests = {}
+
+    def _count(self, route: str):
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def _handler_class(self):
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                replay._serve(self, "GET")
+
+            def do_POST(self):
+                replay._serve(self, "POST")
+
+        return Handler
+
+    # Rutas
+
+    def _serve(self, handler, method: str):
+        url = urlparse(handler.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        route = f"{method} {url.path}"
+        self._count(route)
+
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        if url.path == "/robots.txt":
+            return self._send(handler, "User-agent: *\n", content_type="text/plain")
+        if url.path == "/Login":
+            if method == "POST":
+                length = int(handler.headers.get("Content-Length") or 0)
+                handler.rfile.read(length)
+                return self._redirect(handler, "/Company", set_session=True)
+            return self._page(handler, "Login", LOGIN_FORM)
+
+        if not self._has_session(handler):
+            return self._redirect(handler, "/Login?ReturnUrl=%2fCompany")
+
+        if url.path == "/Company":
+            return self._page(handler, "Empresa", "<h1>Panel de empresa</h1>")
+        if url.path == "/Company/Offers":
+            return self._page(handler, "Ofertas", self._offers_listing(int(params.get("p", 1))))
+        if url.path == "/Company/Candidates" and "oi" in params:
+            body = self._candidates_listing(params["oi"], int(params.get("p", 1)))
+            return self._page(handler, "Candidatos", body)
+        if url.path == "/Candidate/Detail" and "ims" in params:
+            return self._page(handler, "Candidato", self._candidate_detail(params["ims"]))
+
+        return self._send(handler, "Not found", status=404, content_type="text/plain")
+
+    def _has_session(self, handler) -> bool:
+        cookie = SimpleCookie(handler.headers.get("Cookie", ""))
+        return SESSION_COOKIE in cookie and cookie[SESSION_COOKIE].value == SESSION_TOKEN
+
+    def _send(self, handler, body: str, status=200, content_type="text/html; charset=utf-8"):
+        payload = body.encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def _page(self, handler, title: str, body: str):
+        self._send(handler, PAGE.format(title=title, body=body))
+
+    def _redirect(self, handler, location: str, set_session=False):
+        handler.send_response(302)
+        handler.send_header("Location", location)
+        if set_session:
+            handler.send_header("Set-Cookie", f"{SESSION_COOKIE}={SESSION_TOKEN}; Path=/; HttpOnly")
+        handler.send_header("Content-Length", "0")
+        handler.end_headers()
+
+    # Páginas
+
+    def _offers_listing(self, page: int) -> str:
+        pages = max(1, -(-self.offers // self.offers_per_page))
+        first = (page - 1) * self.offers_per_page
+        articles = [
+            OFFER_ARTICLE.format(
+                offer_id=_offer_id(number),
+                number=number,
+                views=f"{1000 + number:,}".replace(",", "."),
+                applicants=self.pages_per_offer * self.candidates_per_page,
+            )
+            for number in range(first, min(first + self.offers_per_page, self.offers))
+        ]
+        return "".join(articles) + _pager("/Company/Offers", {}, page, pages)
+
+    def _candidates_listing(self, offer_id: str, page: int) -> str:
+        first = (page - 1) * self.candidates_per_page
+        articles = [
+            CANDIDATE_ARTICLE.format(
+                offer_id=offer_id,
+                candidate_id=_candidate_id(offer_id, index),
+                days=index % 30,
+                age=20 + index % 40,
+                adequacy=index % 100,
+            )
+            for index in range(first, first + self.candidates_per_page)
+        ]
+        pager = _pager(
+            "/Company/Candidates", {"oi": offer_id}, page, self.pages_per_offer,
+            element_id="pager_Pager_PageSelected",
+        )
+        return "".join(articles) + pager
+
+    def _candidate_detail(self, candidate_id: str) -> str:
+        index = int(candidate_id, 16) % 1_000_000
+        values = {
+            "i_email": f"candidato{index}@example.com",
+            "i_card": f"{10_000_000 + index}",
+            "i_mobile": f"300{index:07d}",
+            "i_flag": "Bogotá, D.C.",
+            "i_partner": "Soltero/a",
+            "i_yes": "Disponible",
+            "i_no": "Sin licencia",
+            "i_money": f"$ {2_000_000 + index * 1000:,}".replace(",", "."),
+        }
+        rows = "\n".join(DETAIL_ROW.format(icon=icon, value=escape(value)) for icon, value in values.items())
+        return DETAIL_PAGE.format(rows=rows, index=index, candidate_id=candidate_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--offers", type=int, default=5)
+    parser.add_argument("--pages-per-offer", type=int, default=3)
+    parser.add_argument("--candidates-per-page", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = ReplayServer(
+        offers=args.offers,
+        pages_per_offer=args.pages_per_offer,
+        candidates_per_page=args.candidates_per_page,
+        latency=args.latency,
+        jitter=args.jitter,
+        port=args.port,
+    ).start()
+    print(f"Sirviendo el sitio de prueba en {server.base_url} (Ctrl+C para terminar)")
+    print(f"Oferta de ejemplo: {server.offer_url(0)}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
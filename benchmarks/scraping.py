@@ -0,0 +1,302 @@
+"""Benchmark the scrapers against the local replay server.
+
+Runs the candidate detail extraction, `process_pagination` and
+`extract_all_offers` against `benchmarks.replay_server` with a temporary
+SQLite database and reports pages/s, candidates/s, WebDriver round trips,
+SQL statements and requests served for each scenario. The browser
+scenarios are skipped when Chrome cannot be started.
+
+Results can be saved as a baseline and later runs compared against it;
+the comparison exits with status 1 when a scenario regresses by more
+than the tolerance or has no baseline to compare with:
+
+    python -m benchmarks.scraping --latency 0.1
+    python -m benchmarks.scraping --latency 0.1 --save-baseline benchmarks/baseline.json
+    python -m benchmarks.scraping --latency 0.1 --compare benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from . import _env  # noqa: F401
+from .replay_server import SESSION_COOKIE, SESSION_TOKEN, ReplayServer
+
+BENCH_ACCOUNT = ("benchmark@example.com", "benchmark")
+
+# Métricas donde un valor mayor es mejor; en las demás, menor es mejor
+RATE_METRICS = ("pages_per_second", "candidates_per_second", "offers_per_second")
+COUNT_METRICS = ("webdriver_commands", "sql_statements", "http_requests")
+
+
+def configure_app(server: ReplayServer, workdir: str, detail_fetcher: str, no_pacing: bool):
+    """Point the settings of the app to the replay server before importing it."""
+    os.environ["COMPUTRABAJO_BASE_URL"] = server.base_url
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'benchmark.db')}"
+    os.environ["SCRAPER_SESSION_DIR"] = os.path.join(workdir, "sessions")
+    os.environ["SCRAPER_DETAIL_FETCHER"] = detail_fetcher
+    if no_pacing:
+        os.environ["SCRAPER_RATE_PER_SECOND"] = "1000"
+        os.environ["SCRAPER_RATE_BURST"] = "1000"
+        os.environ["SCRAPER_PAGE_PAUSE_MIN"] = "0"
+        os.environ["SCRAPER_PAGE_PAUSE_MAX"] = "0"
+
+
+class Counters:
+    """ Count the SQL statements of the app engines and the WebDriver commands. """
+
+    def __init__(self):
+        self.sql_statements = 0
+        self.webdriver_commands = 0
+
+    def reset(self):
+        self.sql_statements = 0
+        self.webdriver_commands = 0
+
+    def watch_engines(self, *engines):
+        from sqlalchemy import event
+
+        def count_statement(*args):
+            self.sql_statements += 1
+
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", count_statement)
+
+    def watch_driver(self, driver):
+        """Wrap `driver.execute`, the single path of every WebDriver command."""
+        execute = driver.execute
+
+        def counted_execute(driver_command, params=None):
+            self.webdriver_commands += 1
+            return execute(driver_command, params)
+
+        driver.execute = counted_execute
+
+
+class Scenario:
+    """ Time one scenario and collect its counters. """
+
+    def __init__(self, name: str, server: ReplayServer, counters: Counters):
+        self.name = name
+        self.server = server
+        self.counters = counters
+        self.result = {"pages": 0, "candidates": 0, "offers": 0}
+
+    def __enter__(self):
+        self.server.reset_counters()
+        self.counters.reset()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self._started
+        result = self.result
+        result["seconds"] = round(seconds, 3)
+        for metric, field in zip(RATE_METRICS, ("pages", "candidates", "offers")):
+            if result[field]:
+                result[metric] = round(result[field] / seconds, 3)
+        result["webdriver_commands"] = self.counters.webdriver_commands
+        result["sql_statements"] = self.counters.sql_statements
+        result["http_requests"] = sum(self.server.requests.values())
+        return False
+
+
+async def bench_http_details(server, counters, args):
+    from app.service.candidate_service import save_candidate_details_batch
+    from app.service.scraping_service.http_fetcher import SessionFetcher
+    from app.service.scraping_service.parsers import parse_candidate_listing
+
+    cookies = [{"name": SESSION_COOKIE, "value": SESSION_TOKEN, "domain": "127.0.0.1", "path": "/"}]
+    with Scenario("detalles_http", server, counters) as scenario:
+        async with SessionFetcher(cookies) as fetcher:
+            for page in range(1, args.pages_per_offer + 1):
+                response = await fetcher.fetch_html(f"{server.offer_url(0)}&p={page}", page="candidates")
+                listing = parse_candidate_listing(response.text, str(response.url))
+                details = await fetcher.fetch_all([
+                    {"details_link": candidate["profile_link"], "uuid_candidate": candidate["candidate_id"]}
+                    for candidate in listing
+                ])
+                await save_candidate_details_batch(details)
+                scenario.result["pages"] += 1
+                scenario.result["candidates"] += sum(1 for candidate in details if candidate)
+    return scenario
+
+
+async def bench_browser_details(driver, server, counters, args):
+    from app.core.pacing import run_blocking
+    from app.service.candidate_service import save_candidate_details_batch
+    from app.service.scraping_service.details_candidate import extract_candidate_details
+    from app.service.scraping_service.job_candidates import extract_candidate_info
+
+    await run_blocking(driver.get, server.offer_url(1))
+    with Scenario("detalles_navegador", server, counters) as scenario:
+        listing = await extract_candidate_info(driver)
+        details = []
+        for candidate in listing:
+            details.append(await extract_candidate_details(
+                driver, candidate["profile_link"], candidate["candidate_id"]
+            ))
+        await save_candidate_details_batch(details)
+        scenario.result["pages"] = 1
+        scenario.result["candidates"] = sum(1 for candidate in details if candidate)
+    return scenario
+
+
+def count_saved_candidates(offer_ids) -> int:
+    from sqlalchemy import func, select
+
+    from app.db.database import engine
+    from app.db.models.candidate import Candidate
+
+    with engine.connect() as connection:
+        return connection.scalar(
+            select(func.count(Candidate.id)).where(Candidate.uuid_offer.in_(offer_ids))
+        )
+
+
+async def bench_pagination(driver, server, counters, args):
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    from app.service.scraping_service.job_candidates import process_pagination
+    from app.utils.utils import extract_offer_id
+
+    offer_urls = [server.offer_url(number) for number in range(2, 2 + args.offers)]
+    with Scenario("paginacion", server, counters) as scenario:
+        for url in offer_urls:
+            if await process_pagination(driver, WebDriverWait(driver, 10), url):
+                scenario.result["offers"] += 1
+        # Páginas servidas y candidatos guardados, no los configurados
+        scenario.result["pages"] = server.requests.get("GET /Company/Candidates", 0)
+        scenario.result["candidates"] = count_saved_candidates([extract_offer_id(url) for url in offer_urls])
+    return scenario
+
+
+async def bench_offers(driver, server, counters, args):
+    from app.service.scraping_service.offer import extract_all_offers
+
+    with Scenario("ofertas", server, counters) as scenario:
+        offers = await extract_all_offers(None, driver, f"{server.base_url}/Company/Offers", 1)
+        scenario.result["offers"] = len(offers)
+        scenario.result["pages"] = server.requests.get("GET /Company/Offers", 0)
+    return scenario
+
+
+async def run_benchmarks(server, args) -> dict:
+    from app.core.pacing import run_blocking
+    from app.core.selenium import apply_blocking_profile, create_driver, _quit_driver
+    from app.db.database import Base, async_engine, engine
+    from app.db.models import init_db  # noqa: F401  registra todos los modelos
+    from app.service.selenium_service import login_account
+
+    Base.metadata.create_all(engine)
+    counters = Counters()
+    counters.watch_engines(engine, async_engine.sync_engine)
+
+    results = {}
+    scenario = await bench_http_details(server, counters, args)
+    results[scenario.name] = scenario.result
+
+    try:
+        driver = await run_blocking(create_driver)
+    except Exception as e:
+        print(f"Chrome no disponible, se omiten los escenarios del navegador: {e}")
+        return results
+
+    try:
+        await run_blocking(apply_blocking_profile, driver, args.resource_blocking)
+        counters.watch_driver(driver)
+        await login_account(driver, *BENCH_ACCOUNT)
+        for bench in (bench_browser_details, bench_pagination, bench_offers):
+            scenario = await bench(driver, server, counters, args)
+            results[scenario.name] = scenario.result
+    finally:
+        await run_blocking(_quit_driver, driver)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Return the metrics that regressed more than `tolerance` against the
+    baseline, and the scenarios of the run that the baseline does not have.
+    """
+    regressions = []
+    for name in baseline["results"].keys() - results.keys():
+        print(f"  {name}: no se ejecutó en esta corrida")
+    for name, result in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            # Un escenario sin línea base no se puede dar por bueno
+            print(f"  {name}: sin línea base, hay que volver a guardarla")
+            regressions.append(name)
+            continue
+        for metric in RATE_METRICS + COUNT_METRICS:
+            if metric not in result or not previous.get(metric):
+                continue
+            change = (result[metric] - previous[metric]) / previous[metric]
+            worse = change < -tolerance if metric in RATE_METRICS else change > tolerance
+            marker = "REGRESIÓN" if worse else "ok"
+            print(f"  {name}.{metric}: {previous[metric]} -> {result[metric]} ({change:+.1%}) {marker}")
+            if worse:
+                regressions.append(f"{name}.{metric}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--offers", type=int, default=2, help="Ofertas recorridas por process_pagination")
+    parser.add_argument("--pages-per-offer", type=int, default=3)
+    parser.add_argument("--candidates-per-page", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="Segundos añadidos a cada respuesta")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--detail-fetcher", choices=("browser", "http"), default="browser")
+    parser.add_argument("--resource-blocking", choices=("none", "standard", "aggressive"),
+                        default="standard", help="Recursos que el navegador no descarga")
+    parser.add_argument("--no-pacing", action="store_true", help="Quita el límite de peticiones por segundo")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    config = {
+        key: getattr(args, key)
+        for key in ("offers", "pages_per_offer", "candidates_per_page", "latency",
+                    "jitter", "detail_fetcher", "resource_blocking", "no_pacing")
+    }
+    server = ReplayServer(
+        offers=2 + args.offers,
+        pages_per_offer=args.pages_per_offer,
+        candidates_per_page=args.candidates_per_page,
+        latency=args.latency,
+        jitter=args.jitter,
+    ).start()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        configure_app(server, workdir, args.detail_fetcher, args.no_pacing)
+        try:
+            results = asyncio.run(run_benchmarks(server, args))
+        finally:
+            server.stop()
+
+    print(json.dumps({"config": config, "results": results}, indent=2))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as file:
+            json.dump({"config": config, "results": results}, file, indent=2)
+        print(f"Línea base guardada en {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline.get("config") != config:
+            print("Aviso: la línea base se midió con otra configuración.")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Regresiones o escenarios sin línea base: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()